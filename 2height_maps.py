@@ -5,6 +5,7 @@ from random import randint, choice, random
 from termcolor import colored
 from gdpc import Block, Editor
 from gdpc import geometry as geo
+from summed_area import window_sums
 import atexit
 import matplotlib.pyplot as plt
 
@@ -26,48 +27,37 @@ def find_flattest_subarray(large_array, sub_array_size):
     if sub_array_size > num_rows or sub_array_size > num_cols:
         raise ValueError("Sub-array size is larger than the original array.")
     
-    # Calculate maximum starting positions
-    max_start_row = num_rows - sub_array_size
-    max_start_col = num_cols - sub_array_size
-    
     # Initialize variables to track flattest sub-array
-    flattest_subarray = None
     flattest_position = None
-    min_gradient_magnitude = float('inf')  # Start with infinity
 
     water_array = WORLDSLICE.heightmaps['MOTION_BLOCKING'] - WORLDSLICE.heightmaps['OCEAN_FLOOR']
 
-    # print(row_indices, col_indices)
+    # Gradient magnitude of the whole heightmap, computed once in float32
+    gy, gx = np.gradient(large_array.astype(np.float32, copy=False))
+    gradient_magnitude = np.hypot(gx, gy)
     
-    # Iterate over all valid starting positions
-    for start_row in range(max_start_row + 1):
-        for start_col in range(max_start_col + 1):
-            # Extract the current sub-array
-            current_subarray = large_array[start_row:start_row + sub_array_size, start_col:start_col + sub_array_size]
-            current_water_subarray = water_array[start_row:start_row + sub_array_size, start_col:start_col + sub_array_size]
-            
-            # Calculate the gradient magnitude for this sub-array
-            gy, gx = np.gradient(current_subarray)
-            gradient_magnitude = np.sqrt(gx**2 + gy**2)
-            avg_gradient = np.mean(gradient_magnitude)
-
-            # print(current_subarray)
-            # print(f'Max value: {np.max(current_subarray)}')
-            # print(f'Average gradient: {avg_gradient}')
-            # input()
-
-            # If this sub-array is flatter than the flattest one found so far, update
-            if avg_gradient < min_gradient_magnitude and np.all(current_water_subarray == 0):
-
-                min_gradient_magnitude = avg_gradient
-                flattest_subarray = current_subarray.copy()  # Make a copy to avoid reference issues
-                flattest_position = (start_row, start_col)
-                max_value = np.max(current_subarray)
+    # Per-window gradient totals and counts of wet cells
+    k = sub_array_size
+    gradient_sums = window_sums(gradient_magnitude, k, dtype=np.float64)
+    water_sums = window_sums(water_array != 0, k)
+    
+    # Average gradient of every window that has no water; the first lowest one wins
+    avg_gradients = np.where(water_sums == 0, gradient_sums / (k * k), np.inf)
+    best = np.unravel_index(np.argmin(avg_gradients), avg_gradients.shape)
+    min_gradient_magnitude = float(avg_gradients[best])
+    if np.isfinite(min_gradient_magnitude):
+        flattest_position = (int(best[0]), int(best[1]))
     
     if flattest_position is None:
         print('There is not flat enough surface that is not on water')
         exit()
 
+    # Copy out the winning window once the search is done
+    start_row, start_col = flattest_position
+    flattest_subarray = large_array[start_row:start_row + sub_array_size,
+                                    start_col:start_col + sub_array_size].copy()
+    max_value = np.max(flattest_subarray)
+
     return flattest_subarray, flattest_position, min_gradient_magnitude, max_value
 
 # Example usage
@@ -81,7 +71,8 @@ if __name__ == "__main__":
     
     # Run analysis for each heightmap
     for heightmap_name in available_heightmaps:
-        heightmap = WORLDSLICE.heightmaps[heightmap_name]
+        # World heights fit in int16, which halves what the search reads
+        heightmap = WORLDSLICE.heightmaps[heightmap_name].astype(np.int16)
         flattest_subarray, position, flatness_value, max_value = find_flattest_subarray(
             heightmap,
             sub_array_size
@@ -2,7 +2,7 @@
 import logging
 import numpy as np
 import math
-from random import randint, choice, random
+from random import randint, choice, random, getrandbits
 from termcolor import colored
 from gdpc import Block, Editor
 from gdpc import geometry as geo
@@ -1112,20 +1112,25 @@ def create_basement(ED, xaxis, zaxis, y, width, length, theme_materials):
         Block("air")
     )
     
-    # Add basement walls
-    for dx in range(-width//2 + 1, width//2):
-        for dz in range(-length//2 + 1, length//2):
-            for dy in range(-basement_height, -1):
-                # Skip floor
-                if dy == -basement_height:
-                    continue
-                
-                # Only build the perimeter
-                if dx == -width//2 + 1 or dx == width//2 - 1 or dz == -length//2 + 1 or dz == length//2 - 1:
-                    ED.placeBlock(
-                        (xaxis + dx, y + dy, zaxis + dz),
-                        get_random_block(theme_materials["foundation"])
-                    )
+    # Add basement walls, visiting only the perimeter cells above the floor
+    wall_x0, wall_x1 = -width//2 + 1, width//2 - 1
+    wall_z0, wall_z1 = -length//2 + 1, length//2 - 1
+    for dy in range(-basement_height + 1, -1):
+        # West and east walls, corners included
+        for dx in (wall_x0, wall_x1):
+            for dz in range(wall_z0, wall_z1 + 1):
+                ED.placeBlock(
+                    (xaxis + dx, y + dy, zaxis + dz),
+                    get_random_block(theme_materials["foundation"])
+                )
+        
+        # North and south walls between the corners
+        for dz in (wall_z0, wall_z1):
+            for dx in range(wall_x0 + 1, wall_x1):
+                ED.placeBlock(
+                    (xaxis + dx, y + dy, zaxis + dz),
+                    get_random_block(theme_materials["foundation"])
+                )
     
     # Add basement floor
     for dx in range(-width//2 + 2, width//2 - 1):
@@ -1178,8 +1183,9 @@ def create_basement(ED, xaxis, zaxis, y, width, length, theme_materials):
     
     # Add some ores in the walls to suggest a mine
     ore_types = ["coal_ore", "iron_ore", "gold_ore", "redstone_ore"]
+    west_wall, east_wall = -width//2 + 1, width//2 - 1
     for _ in range(8):
-        dx = choice([-width//2 + 1, width//2 - 1])
+        dx = west_wall if getrandbits(1) else east_wall
         dz = randint(-length//2 + 2, length//2 - 2)
         dy = randint(-basement_height, -2)
         ED.placeBlock((xaxis + dx, y + dy, zaxis + dz), Block(choice(ore_types)))
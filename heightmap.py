@@ -1,16 +1,18 @@
 #!/usr/bin/env python3
 import logging
+from itertools import groupby
 import numpy as np
 import random
 from termcolor import colored
 from gdpc import Block, Editor
 from gdpc import geometry as geo
+from summed_area import window_sums
 import atexit
 import matplotlib.pyplot as plt
 
 # Set up logging and editor
 logging.basicConfig(format=colored("%(name)s - %(levelname)s - %(message)s", color="yellow"))
-ED = Editor(buffering=True)
+ED = Editor(buffering=True, bufferLimit=4096)
 atexit.register(ED.flushBuffer)
 BUILD_AREA = ED.getBuildArea()
 STARTX, STARTY, STARTZ = BUILD_AREA.begin
@@ -29,29 +31,24 @@ def smooth_heightmap(heightmap, window_size=3, threshold=2):
     Returns:
         Smoothed heightmap array
     """
-    # Create a copy of the original heightmap
-    smoothed = heightmap.copy()
-    rows, cols = heightmap.shape
     pad = window_size // 2
 
     # Pad the array to handle edges
     padded = np.pad(heightmap, pad, mode='edge')
 
-    # Iterate through each cell in the original heightmap
-    for i in range(rows):
-        for j in range(cols):
-            # Extract the local window
-            window = padded[i:i + window_size, j:j + window_size]
-            
-            # Calculate local statistics
-            local_median = np.median(window)
-            local_std = np.std(window)
-            
-            # Check if the center value is an outlier
-            center_value = heightmap[i, j]
-            if abs(center_value - local_median) > threshold * local_std:
-                # Replace with local median if it's an outlier
-                smoothed[i, j] = local_median
+    # Every cell's local window at once, flattened to (rows, cols, window_size**2) so each
+    # window reduces in the same order as a single np.median/np.std call on it would
+    windows = np.lib.stride_tricks.sliding_window_view(padded, (window_size, window_size))
+    windows = windows.reshape(*heightmap.shape, window_size * window_size)
+    
+    # Calculate local statistics
+    local_median = np.median(windows, axis=-1)
+    local_std = np.std(windows, axis=-1)
+    
+    # Replace the values that are outliers with their local median
+    outliers = np.abs(heightmap - local_median) > threshold * local_std
+    smoothed = heightmap.copy()
+    smoothed[outliers] = local_median[outliers]
 
     return smoothed
 
@@ -63,47 +60,46 @@ def find_flattest_subarray(large_array, sub_array_size):
     if sub_array_size > num_rows or sub_array_size > num_cols:
         raise ValueError("Sub-array size is larger than the original array.")
     
-    # Calculate maximum starting positions
-    max_start_row = num_rows - sub_array_size
-    max_start_col = num_cols - sub_array_size
-    
     # Initialize variables to track flattest sub-array
-    flattest_subarray = None
     flattest_position = None
-    min_gradient_magnitude = float('inf')  # Start with infinity
 
     water_array = WORLDSLICE.heightmaps['MOTION_BLOCKING'] - WORLDSLICE.heightmaps['OCEAN_FLOOR']
     leaves_array = WORLDSLICE.heightmaps['MOTION_BLOCKING'] - WORLDSLICE.heightmaps['MOTION_BLOCKING_NO_LEAVES']
     
-    # Iterate over all valid starting positions
-    for start_row in range(max_start_row + 1):
-        for start_col in range(max_start_col + 1):
-            # Extract the current sub-array
-            current_subarray = large_array[start_row:start_row + sub_array_size, start_col:start_col + sub_array_size]
-            current_water_subarray = water_array[start_row:start_row + sub_array_size, start_col:start_col + sub_array_size]
-            
-            # Calculate the gradient magnitude for this sub-array
-            gy, gx = np.gradient(current_subarray)
-            gradient_magnitude = np.sqrt(gx**2 + gy**2)
-            avg_gradient = np.mean(gradient_magnitude)
-
-            # If this sub-array is flatter than the flattest one found so far and there is no water, update
-            if avg_gradient < min_gradient_magnitude and np.all(current_water_subarray == 0):
-
-                min_gradient_magnitude = avg_gradient
-                flattest_subarray = current_subarray.copy()  # Make a copy to avoid reference issues
-                flattest_position = (start_row, start_col)
-                max_value = np.max(current_subarray)
+    # Gradient magnitude of the whole heightmap, computed once in float32
+    gy, gx = np.gradient(large_array.astype(np.float32, copy=False))
+    gradient_magnitude = np.hypot(gx, gy)
+    
+    # Per-window gradient totals and counts of wet and leafy cells
+    k = sub_array_size
+    gradient_sums = window_sums(gradient_magnitude, k, dtype=np.float64)
+    water_sums = window_sums(water_array != 0, k)
+    leaves_sums = window_sums(leaves_array != 0, k)
+    
+    # Only windows without water qualify, and of those, windows clear of trees are preferred
+    # unless there are none (dense forest); the first lowest average gradient wins
+    valid = water_sums == 0
+    if (valid & (leaves_sums == 0)).any():
+        valid &= leaves_sums == 0
+    avg_gradients = np.where(valid, gradient_sums / (k * k), np.inf)
+    best = np.unravel_index(np.argmin(avg_gradients), avg_gradients.shape)
+    min_gradient_magnitude = float(avg_gradients[best])
+    if np.isfinite(min_gradient_magnitude):
+        flattest_position = (int(best[0]), int(best[1]))
     
     if flattest_position is None:
         print('There is not flat enough surface that is not on water')
         exit()
 
-    # Check for leaves in the optimal area
+    # Copy out the winning window once the search is done
     start_row, start_col = flattest_position
-    optimal_area_leaves = leaves_array[start_row:start_row + sub_array_size, 
-                                     start_col:start_col + sub_array_size]
-    trees_present = np.any(optimal_area_leaves > 0)
+    flattest_subarray = large_array[start_row:start_row + sub_array_size,
+                                    start_col:start_col + sub_array_size].copy()
+    max_value = np.max(flattest_subarray)
+
+    # Leaves in the optimal area were already counted by the search; only the dense-forest
+    # fallback can pick a window that has any
+    trees_present = leaves_sums[start_row, start_col] > 0
 
     if trees_present:
         # Usage in your code:
@@ -118,18 +114,18 @@ def find_flattest_subarray(large_array, sub_array_size):
         # Get array dimensions
         rows, cols = smoothed_heightmap.shape
         
-        # Clear everything above the foundation height in the expanded area
+        # Clear everything above the foundation height in the expanded area, from the local
+        # smoothed height up to a reasonable height, one cuboid per run of equal heights along z
+        z_start = max(0, start_col - margin)
+        z_end = min(cols, start_col + sub_array_size + margin)
         for dx in range(max(0, start_row - margin), min(rows, start_row + sub_array_size + margin)):
-            for dz in range(max(0, start_col - margin), min(cols, start_col + sub_array_size + margin)):
-                world_x = STARTX + dx
-                world_z = STARTZ + dz
-                
-                # Get the height from smoothed_heightmap at this position
-                local_height = smoothed_heightmap[dx, dz]
-                
-                # Clear from local smoothed height up to a reasonable height
-                for y in range(int(local_height), int(local_height) + 20):
-                    ED.placeBlock((world_x, y, world_z), Block("air"))
+            world_x = STARTX + dx
+            world_z = STARTZ + z_start
+            for local_height, run in groupby(smoothed_heightmap[dx, z_start:z_end].tolist()):
+                run_end_z = world_z + len(list(run)) - 1
+                geo.placeCuboid(ED, (world_x, int(local_height), world_z), (world_x, int(local_height) + 19, run_end_z),
+                                Block("air"))
+                world_z = run_end_z + 1
 
     return flattest_subarray, flattest_position, min_gradient_magnitude, max_value
 
@@ -142,37 +138,22 @@ def place_block(position, process_area):
 
     heights = WORLDSLICE.heightmaps["MOTION_BLOCKING_NO_LEAVES"]
 
-    max_local_height = 0
+    # Heights of the whole area in one slice (heightmap indices are (x,z))
+    area_heights = heights[optimal_x:optimal_x + process_area, optimal_z:optimal_z + process_area]
+    max_local_height = int(area_heights.max())
 
-    for dx in range(process_area):
-        for dz in range(process_area):
-            # Calculate world coordinates
-            world_x = STARTX + optimal_x + dx
-            world_z = STARTZ + optimal_z + dz
+    # Fill the entire optimal area with cobblestone, one cuboid per run of equal heights along z
+    for dx, column_heights in enumerate(area_heights.tolist()):
+        world_x = STARTX + optimal_x + dx
+        world_z = STARTZ + optimal_z
+        for height, run in groupby(column_heights):
+            run_end_z = world_z + len(list(run)) - 1
             
-            # Get height at this position
-            local_x = optimal_x + dx
-            local_z = optimal_z + dz
-            height = heights[(local_x, local_z)]
-
-            if height > max_local_height:
-                max_local_height = height
-
-    # Fill the entire optimal area with cobblestone
-    for dx in range(process_area):
-        for dz in range(process_area):
-            # Calculate world coordinates
-            world_x = STARTX + optimal_x + dx
-            world_z = STARTZ + optimal_z + dz
-            
-            # Get height at this position
-            local_x = optimal_x + dx
-            local_z = optimal_z + dz
-            height = heights[(local_x, local_z)]  # Note: heightmap indices are (x,z)
-            
-            # Place cobblestone blocks from the ground up to 3 blocks high
-            for y in range(height, max_local_height):  # You can adjust the +3 to change wall height
-                ED.placeBlock((world_x, y, world_z), Block("cobblestone"))
+            # Place cobblestone blocks from the ground up to just below max_local_height
+            if height < max_local_height:
+                geo.placeCuboid(ED, (world_x, height, world_z), (world_x, max_local_height - 1, run_end_z),
+                                Block("cobblestone"))
+            world_z = run_end_z + 1
 
     # ED.placeBlock((relative_x, path_y, relative_z), Block("cobblestone"))
 
@@ -181,13 +162,17 @@ if __name__ == "__main__":
 
     available_height_maps = ["WORLD_SURFACE", "MOTION_BLOCKING", "MOTINO_BLOCKING_NO_LEAVES", "OCEAN_FLOOR"]
 
-    heightmap = WORLDSLICE.heightmaps["MOTION_BLOCKING_NO_LEAVES"] # The top non-air solid blocks.
+    # The top non-air solid blocks; world heights fit in int16, which halves what the search reads
+    heightmap = WORLDSLICE.heightmaps["MOTION_BLOCKING_NO_LEAVES"].astype(np.int16)
     
     # Find the flattest 10x10 sub-array
     sub_array_size = random.randint(6, 8)
     flattest_subarray, position, flatness_value, max_value = find_flattest_subarray(heightmap, sub_array_size)
     place_block(position, sub_array_size)
     
+    # Send the rest of the build now rather than after the plot window is closed
+    ED.flushBuffer()
+    
     # print(f"The flattest {sub_array_size}x{sub_array_size} sub-array starts at position {position}")
     # print(f"Average gradient magnitude (flatness value): {flatness_value:.4f}")
     
@@ -1,19 +1,25 @@
 #!/usr/bin/env python3
 
 import logging
-from random import randint, choice, random
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import random
 from termcolor import colored
 from gdpc import Block, Editor
 from gdpc import geometry as geo
-import math
 
 # Set up logging and editor
 logging.basicConfig(format=colored("%(name)s - %(levelname)s - %(message)s", color="yellow"))
-ED = Editor(buffering=True)
+# Large buffers are flushed on a background thread so HTTP sends overlap with generation.
+# A single worker keeps block placements in issue order, which the builders rely on.
+ED = Editor(buffering=True, bufferLimit=16384, multithreading=True)
 BUILD_AREA = ED.getBuildArea()
 STARTX, STARTY, STARTZ = BUILD_AREA.begin
 LASTX, LASTY, LASTZ = BUILD_AREA.last
 WORLDSLICE = ED.loadWorldSlice(BUILD_AREA.toRect(), cache=True)
+# World heights fit comfortably in int16; a contiguous copy keeps the footprint slices compact
+HEIGHTMAP = np.ascontiguousarray(WORLDSLICE.heightmaps["MOTION_BLOCKING_NO_LEAVES"], dtype=np.int16)
 
 # Enhanced materials palette with theme options
 THEMES = {
@@ -59,29 +65,80 @@ THEMES = {
     }
 }
 
-def get_random_block(block_list):
-    """Select a random block from the provided list"""
-    return Block(choice(block_list))
+WINDOW_STYLES = ["tall", "wide", "arched", "square"]
 
-def get_weighted_random(block_list, primary_weight=0.7):
-    """Get a block with weighting to prefer the primary option"""
-    if random() < primary_weight:
-        return Block(block_list[0])
-    return Block(choice(block_list[1:]))
+def _frame_stencil(window_height, window_width):
+    """Offsets (dy, dx, is_frame) of a window with a one block frame around the glass"""
+    return tuple(
+        (dy, dx, dy == -1 or dy == window_height or dx == -1 or dx == window_width)
+        for dy in range(-1, window_height + 1)
+        for dx in range(-1, window_width + 1)
+    )
+
+# Frame/glass layout of each window style, relative to the window's bottom-left pane
+WINDOW_STENCILS = {
+    "tall": _frame_stencil(3, 1),
+    "wide": _frame_stencil(2, 2),
+    # Arched windows have no bottom frame and a frame block on top of the glass
+    "arched": tuple((dy, dx, dx == -1 or dx == 1 or dy == 3) for dy in range(4) for dx in range(-1, 2)),
+    "square": _frame_stencil(1, 1),
+}
+
+# Tree canopy offsets (dx, dy, dz) from the top of the trunk, with the corners cut off
+CANOPY_OFFSETS = tuple(
+    (cx, cy, cz)
+    for cx in range(-2, 3)
+    for cz in range(-2, 3)
+    for cy in range(2)
+    if not (abs(cx) == 2 and abs(cz) == 2)
+)
+
+# Depth of the basement below the house floor
+BASEMENT_HEIGHT = 4
+
+# A 3x3 square of (dx, dz) offsets, and the same square without its centre
+SQUARE_OFFSETS = tuple((dx, dz) for dx in range(-1, 2) for dz in range(-1, 2))
+RING_OFFSETS = tuple((dx, dz) for dx, dz in SQUARE_OFFSETS if dx != 0 or dz != 0)
 
-def create_terrain_adjustment_map(heights, xaxis, zaxis, width, length, target_y, STARTX, STARTZ):
-    """Create a map of terrain adjustments needed"""
+@functools.lru_cache(maxsize=512)
+def _block(name, **states):
+    """Return a shared Block for the given id and states, creating it only once"""
+    return Block(name, states)
+
+# The palettes above as tuples of shared Block objects, built once at import so the
+# builders can index them directly instead of looking up block names per placement
+THEME_BLOCKS = {
+    theme_name: {part: tuple(_block(name) for name in names) for part, names in materials.items()}
+    for theme_name, materials in THEMES.items()
+}
+
+# Fixed blocks used inside placement loops
+B_AIR = _block("air")
+B_FENCE = _block("spruce_fence")
+B_LANTERN = _block("lantern")
+B_LANTERN_HANG = _block("lantern", hanging="true")
+B_COBBLE = _block("cobblestone")
+B_CAMPFIRE_LIT = _block("campfire", lit="true")
+STAIRS = {facing: _block("spruce_stairs", facing=facing) for facing in ("north", "south", "east", "west")}
+
+def random_blocks(blocks, n, rng):
+    """Draw n blocks from a palette of Blocks with a single NumPy call"""
+    return [blocks[i] for i in rng.integers(0, len(blocks), n)]
+
+def create_terrain_adjustment_map(heightmap, xaxis, zaxis, width, length, target_y, STARTX, STARTZ):
+    """Create a map of terrain adjustments needed from a 2D heightmap array"""
     adjustments = {}
+    size_x, size_z = heightmap.shape
     for dx in range(-width//2 - 3, width//2 + 4):
         for dz in range(-length//2 - 3, length//2 + 4):
             x, z = xaxis + dx, zaxis + dz
-            if 0 <= x - STARTX < len(heights) and 0 <= z - STARTZ < len(heights[0]):
-                current_height = heights[(x - STARTX, z - STARTZ)]
+            if 0 <= x - STARTX < size_x and 0 <= z - STARTZ < size_z:
+                current_height = int(heightmap[x - STARTX, z - STARTZ])
                 adjustments[(x, z)] = target_y - current_height
     return adjustments
 
-def create_garden(ED, xaxis, zaxis, y, width, length, theme_materials, adjustments):
-    """Create a garden around the house"""
+def create_garden(ED, xaxis, zaxis, y, width, length, theme_materials, adjustments, rng):
+    """Create a garden around the house, drawing from rng"""
     print("Creating garden...")
     garden_radius = max(width, length) + 5
     
@@ -93,30 +150,62 @@ def create_garden(ED, xaxis, zaxis, y, width, length, theme_materials, adjustmen
     door_x = xaxis - width//2
     door_z = zaxis
     
-    # Create curved path
-    for i in range(path_length):
-        curve_factor = math.sin(i / path_length * math.pi) * 2
+    # Blocks for the path and garden features, looked up once
+    path_blocks = tuple(_block(name) for name in ("gravel", "cobblestone", "stone"))
+    path_flowers = tuple(_block(name) for name in ("poppy", "dandelion", "blue_orchid", "allium", "azure_bluet"))
+    garden_flowers = path_flowers + tuple(
+        _block(name) for name in ("orange_tulip", "red_tulip", "white_tulip", "pink_tulip")
+    )
+    deco_blocks = tuple(_block(name) for name in ("composter", "beehive", "barrel", "lantern"))
+    grass = _block("grass_block")
+    log = _block("oak_log")
+    dirt = _block("dirt")
+    water = _block("water")
+    leaves = _block("oak_leaves")
+    
+    # Create curved path, with the block and flower draws for every path cell made up front
+    curve_factors = np.sin(np.arange(path_length) / path_length * np.pi) * 2
+    path_shape = (path_length, 2 * path_width + 1)
+    path_picks = rng.integers(0, len(path_blocks), path_shape)
+    path_flower_draws = rng.random(path_shape)
+    path_flower_picks = rng.integers(0, len(path_flowers), path_shape)
+    for i, curve_factor in enumerate(curve_factors):
         center_x = door_x - i - 1
         for j in range(-path_width, path_width + 1):
             pz = door_z + int(curve_factor * j / path_width)
             if (center_x, pz) in adjustments:
-                ED.placeBlock((center_x, y - 1, pz), get_random_block(["gravel", "cobblestone", "stone"]))
+                ED.placeBlock((center_x, y - 1, pz), path_blocks[path_picks[i, j + path_width]])
                 
                 # Add some flowers alongside path
-                if abs(j) == path_width and random() < 0.4:
-                    flowers = ["poppy", "dandelion", "blue_orchid", "allium", "azure_bluet"]
+                if abs(j) == path_width and path_flower_draws[i, j + path_width] < 0.4:
                     if (center_x, pz + j//abs(j)) in adjustments:
-                        ED.placeBlock((center_x, y, pz + j//abs(j)), Block(choice(flowers)))
+                        ED.placeBlock((center_x, y, pz + j//abs(j)),
+                                      path_flowers[path_flower_picks[i, j + path_width]])
+    
+    # Draw a feature label for every garden cell up front:
+    # 0 flowers, 1 bush, 2 tree, 3 decoration, 4 pond, 5 nothing
+    feature_probs = np.array([0.03, 0.02, 0.01, 0.01, 0.01, 0.92])
+    garden_shape = (2 * garden_radius + 1, 2 * garden_radius + 1)
+    feature_labels = rng.choice(len(feature_probs), size=garden_shape, p=feature_probs)
+    
+    # The per-feature draws for every cell, likewise drawn once
+    flower_picks = rng.integers(0, len(garden_flowers), garden_shape)
+    deco_picks = rng.integers(0, len(deco_blocks), garden_shape)
+    tree_heights = rng.integers(4, 7, garden_shape)
+    has_lilypad = rng.random(garden_shape) < 0.5
+    
+    # Columns that overlap the house only visit the strips in front of and behind it,
+    # so the house footprint itself is never iterated
+    house_min_x, house_max_x = -width//2 - 1, width//2 + 1
+    house_min_z, house_max_z = -length//2 - 1, length//2 + 1
+    all_dz = range(-garden_radius, garden_radius + 1)
+    outside_dz = [*range(-garden_radius, house_min_z), *range(house_max_z + 1, garden_radius + 1)]
     
     # Add garden features
     for dx in range(-garden_radius, garden_radius + 1):
-        for dz in range(-garden_radius, garden_radius + 1):
+        for dz in (outside_dz if house_min_x <= dx <= house_max_x else all_dz):
             x, z = xaxis + dx, zaxis + dz
             
-            # Skip if inside house
-            if -width//2 - 1 <= dx <= width//2 + 1 and -length//2 - 1 <= dz <= length//2 + 1:
-                continue
-                
             # Calculate distance from house for circular garden
             dist_from_house = max(
                 abs(dx) - width//2,
@@ -126,41 +215,62 @@ def create_garden(ED, xaxis, zaxis, y, width, length, theme_materials, adjustmen
             if dist_from_house <= 10 and (x, z) in adjustments:
                 # Grass base everywhere in garden
                 if adjustments[(x, z)] <= 0:
-                    ED.placeBlock((x, y - 1, z), Block("grass_block"))
+                    ED.placeBlock((x, y - 1, z), grass)
                     
                     # Add features 
-                    feature_chance = random()
-                    if feature_chance < 0.03:  # Flowers
-                        flowers = ["poppy", "dandelion", "blue_orchid", "allium", "azure_bluet", 
-                                  "orange_tulip", "red_tulip", "white_tulip", "pink_tulip"]
-                        ED.placeBlock((x, y, z), Block(choice(flowers)))
-                    elif feature_chance < 0.05:  # Bushes
-                        ED.placeBlock((x, y, z), Block("oak_leaves"))
-                    elif feature_chance < 0.06:  # Trees
+                    cell = (dx + garden_radius, dz + garden_radius)
+                    feature = feature_labels[cell]
+                    if feature == 0:  # Flowers
+                        ED.placeBlock((x, y, z), garden_flowers[flower_picks[cell]])
+                    elif feature == 1:  # Bushes
+                        ED.placeBlock((x, y, z), leaves)
+                    elif feature == 2:  # Trees
                         if dist_from_house > 3:
-                            tree_height = randint(4, 6)
-                            for ty in range(tree_height):
-                                ED.placeBlock((x, y + ty, z), Block("oak_log"))
+                            tree_height = int(tree_heights[cell])
+                            geo.placeCuboid(ED, (x, y, z), (x, y + tree_height - 1, z), log)
                             # Canopy
-                            for cx in range(-2, 3):
-                                for cz in range(-2, 3):
-                                    for cy in range(2):
-                                        if abs(cx) == 2 and abs(cz) == 2:
-                                            continue
-                                        ED.placeBlock((x + cx, y + tree_height - 1 + cy, z + cz), Block("oak_leaves"))
-                    elif feature_chance < 0.07:  # Garden decoration
-                        deco_options = ["composter", "beehive", "barrel", "lantern"]
-                        ED.placeBlock((x, y, z), Block(choice(deco_options)))
-                    elif feature_chance < 0.08 and dist_from_house > 5:  # Pond
-                        for px in range(-1, 2):
-                            for pz in range(-1, 2):
-                                if (x + px, z + pz) in adjustments:
-                                    ED.placeBlock((x + px, y - 1, z + pz), Block("dirt"))
-                                    ED.placeBlock((x + px, y, z + pz), Block("water"))
-                                    
-                                    # Add lilypads
-                                    if px == 0 and pz == 0 and random() < 0.5:
-                                        ED.placeBlock((x, y + 1, z), Block("lily_pad"))
+                            canopy_y = y + tree_height - 1
+                            for cx, cy, cz in CANOPY_OFFSETS:
+                                ED.placeBlock((x + cx, canopy_y + cy, z + cz), leaves)
+                    elif feature == 3:  # Garden decoration
+                        ED.placeBlock((x, y, z), deco_blocks[deco_picks[cell]])
+                    elif feature == 4 and dist_from_house > 5:  # Pond
+                        for px, pz in SQUARE_OFFSETS:
+                            if (x + px, z + pz) in adjustments:
+                                ED.placeBlock((x + px, y - 1, z + pz), dirt)
+                                ED.placeBlock((x + px, y, z + pz), water)
+                                
+                                # Add lilypads
+                                if px == 0 and pz == 0 and has_lilypad[cell]:
+                                    ED.placeBlock((x, y + 1, z), _block("lily_pad"))
+
+def garden_boxes(xaxis, zaxis, y, width, length):
+    """Inclusive (low, high) boxes that hold every block create_garden can place.
+    
+    The features and tree canopies stay outside the house walls, so they fit in four strips
+    around them; the path is the only part that reaches the west wall column.
+    """
+    garden_radius = max(width, length) + 5
+    path_length = garden_radius // 2
+    path_width = 2
+    reach = garden_radius + max(abs(cx) for cx, _, _ in CANOPY_OFFSETS)
+    top = y + 5 + max(cy for _, cy, _ in CANOPY_OFFSETS)
+    # The walls run from -width//2 to width//2, which rounds down on the west and north sides
+    west_x, east_x = xaxis + (-width//2), xaxis + width//2
+    north_z, south_z = zaxis + (-length//2), zaxis + length//2
+    door_x, door_z = xaxis - width//2, zaxis
+    return (
+        ((xaxis - reach, y - 1, zaxis - reach), (west_x - 1, top, zaxis + reach)),
+        ((east_x + 1, y - 1, zaxis - reach), (xaxis + reach, top, zaxis + reach)),
+        ((west_x, y - 1, zaxis - reach), (east_x, top, north_z - 1)),
+        ((west_x, y - 1, south_z + 1), (east_x, top, zaxis + reach)),
+        ((door_x - path_length, y - 1, door_z - path_width - 1), (door_x - 1, y, door_z + path_width + 1)),
+    )
+
+def _boxes_overlap(a, b):
+    """Whether two inclusive (low, high) boxes share a block"""
+    (a_low, a_high), (b_low, b_high) = a, b
+    return all(al <= bh and bl <= ah for al, ah, bl, bh in zip(a_low, a_high, b_low, b_high))
 
 def clear_space(ED, xaxis, zaxis, y, width, length, height, roof_style="pitched"):
     """Clear the space for the house"""
@@ -171,7 +281,7 @@ def clear_space(ED, xaxis, zaxis, y, width, length, height, roof_style="pitched"
         ED,
         (xaxis - width//2 + 1, y, zaxis - length//2 + 1),
         (xaxis + width//2 - 1, y + height - 1, zaxis + length//2 - 1),
-        Block("air")
+        B_AIR
     )
     
     # Clear roof space based on style
@@ -182,7 +292,7 @@ def clear_space(ED, xaxis, zaxis, y, width, length, height, roof_style="pitched"
                 ED,
                 (xaxis - width//2 + i, y + height - 1, zaxis - length//2),
                 (xaxis + width//2 - i, y + height + roof_height - 1, zaxis + length//2),
-                Block("air")
+                B_AIR
             )
     elif roof_style == "dome":
         radius = width // 2
@@ -190,231 +300,254 @@ def clear_space(ED, xaxis, zaxis, y, width, length, height, roof_style="pitched"
             for dy in range(0, radius + 1):
                 for dz in range(-length//2, length//2 + 1):
                     if dx**2 + dy**2 <= radius**2:
-                        ED.placeBlock((xaxis + dx, y + height + dy, zaxis + dz), Block("air"))
+                        ED.placeBlock((xaxis + dx, y + height + dy, zaxis + dz), B_AIR)
 
-def build_foundation(ED, xaxis, zaxis, y, width, length, theme_materials, adjustments):
-    """Build the house foundation with enhanced terrain adaptation"""
-    print("Building foundation...")
+def flush_blocks(ED, items):
+    """Send unique (position, block) pairs grouped by block, as a cuboid where the group fills its box"""
+    groups = {}
+    for position, block in items:
+        groups.setdefault(id(block), (block, []))[1].append(position)
+
+    for block, positions in groups.values():
+        xs, ys, zs = np.array(positions).T
+        low = (int(xs.min()), int(ys.min()), int(zs.min()))
+        high = (int(xs.max()), int(ys.max()), int(zs.max()))
+        volume = (high[0] - low[0] + 1) * (high[1] - low[1] + 1) * (high[2] - low[2] + 1)
+        if volume == len(positions):
+            geo.placeCuboid(ED, low, high, block)
+        else:
+            ED.placeBlock(positions, block)
+
+def apply_placements(ED, placements):
+    """Send planned {position: block} placements to the editor in batches"""
+    flush_blocks(ED, placements.items())
+
+def plan_foundation(xaxis, zaxis, y, width, length, theme_materials, theme_blocks, adjustments, rng):
+    """Plan the house foundation with enhanced terrain adaptation, drawing from rng"""
+    print("Planning foundation...")
+    placements = {}
+    
+    # Loop bounds and edge offsets are fixed for the whole foundation
+    edge_dx = width//2 + 1
+    edge_dz = length//2 + 1
+    dx_range = range(-width//2 - 1, width//2 + 2)
+    dz_range = range(-length//2 - 1, length//2 + 2)
+    
+    # Terrain adjustments over the foundation rectangle, 0 where the map has no data
+    adjustment_grid = np.array([[adjustments.get((xaxis + dx, zaxis + dz), 0) for dz in dz_range]
+                                for dx in dx_range])
+    needs_pillar = adjustment_grid > 0
     
     # Find the lowest terrain point
-    min_height = y
-    for dx in range(-width//2 - 1, width//2 + 2):
-        for dz in range(-length//2 - 1, length//2 + 2):
-            pos = (xaxis + dx, zaxis + dz)
-            if pos in adjustments and adjustments[pos] > 0:
-                current_height = y - adjustments[pos]
-                min_height = min(min_height, current_height)
-    
-    # Base foundation with variable height pillars where needed
-    for dx in range(-width//2 - 1, width//2 + 2):
-        for dz in range(-length//2 - 1, length//2 + 2):
-            pos = (xaxis + dx, zaxis + dz)
-            if pos in adjustments:
-                if adjustments[pos] > 0:
-                    # Need to build up to level
-                    current_height = y - adjustments[pos]
-                    
-                    # Determine if this is a corner pillar or edge
-                    is_corner = (abs(dx) == width//2 + 1 and abs(dz) == length//2 + 1)
-                    is_edge = (abs(dx) == width//2 + 1 or abs(dz) == length//2 + 1)
-                    
-                    material = get_random_block(theme_materials["foundation"])
-                    
-                    # Create foundation pillar
-                    geo.placeCuboid(
-                        ED,
-                        (xaxis + dx, current_height, zaxis + dz),
-                        (xaxis + dx, y - 1, zaxis + dz),
-                        material
-                    )
-                    
-                    # Add decorative elements to tall pillars
-                    if is_corner and y - current_height > 3:
-                        # Add wall section with different material
-                        middle_y = current_height + (y - current_height) // 2
-                        geo.placeCuboid(
-                            ED,
-                            (xaxis + dx, middle_y - 1, zaxis + dz),
-                            (xaxis + dx, middle_y + 1, zaxis + dz),
-                            Block(theme_materials["accent"][0])
-                        )
-                    
-                    # Add supportive beams for very tall sections
-                    if y - current_height > 5 and is_edge and not is_corner:
-                        # Find nearest corners
-                        corner_dx = width//2 + 1 if dx > 0 else -(width//2 + 1)
-                        corner_dz = length//2 + 1 if dz > 0 else -(length//2 + 1)
-                        
-                        # Add support beam from pillar to nearby corners if on edge
-                        if abs(dx) == width//2 + 1:
-                            ED.placeBlock((xaxis + dx, current_height + 1, zaxis + dz), 
-                                         Block("dark_oak_log", {"axis": "z"}))
-                        elif abs(dz) == length//2 + 1:
-                            ED.placeBlock((xaxis + dx, current_height + 1, zaxis + dz), 
-                                         Block("dark_oak_log", {"axis": "x"}))
-    
-    # Main foundation platform
-    for dx in range(-width//2 - 1, width//2 + 2):
-        for dz in range(-length//2 - 1, length//2 + 2):
+    min_height = min(y, int((y - adjustment_grid[needs_pillar]).min())) if needs_pillar.any() else y
+    
+    # Base foundation with variable height pillars, only where the terrain is below the floor
+    pillar_cells = np.argwhere(needs_pillar)
+    pillar_materials = random_blocks(theme_blocks["foundation"], len(pillar_cells), rng)
+    for (ix, iz), material in zip(pillar_cells, pillar_materials):
+        dx, dz = dx_range[ix], dz_range[iz]
+        x, z = xaxis + dx, zaxis + dz
+        
+        # Need to build up to level
+        current_height = y - int(adjustment_grid[ix, iz])
+        
+        # Determine if this is a corner pillar or edge
+        on_x_edge = abs(dx) == edge_dx
+        on_z_edge = abs(dz) == edge_dz
+        is_corner = on_x_edge and on_z_edge
+        is_edge = on_x_edge or on_z_edge
+        
+        # Create foundation pillar
+        for pillar_y in range(current_height, y):
+            placements[(x, pillar_y, z)] = material
+        
+        # Add decorative elements to tall pillars
+        if is_corner and y - current_height > 3:
+            # Add wall section with different material
+            middle_y = current_height + (y - current_height) // 2
+            for band_y in range(middle_y - 1, middle_y + 2):
+                placements[(x, band_y, z)] = _block(theme_materials["accent"][0])
+        
+        # Add supportive beams for very tall sections
+        if y - current_height > 5 and is_edge and not is_corner:
+            # Find nearest corners
+            corner_dx = edge_dx if dx > 0 else -edge_dx
+            corner_dz = edge_dz if dz > 0 else -edge_dz
+            
+            # Add support beam from pillar to nearby corners if on edge
+            if on_x_edge:
+                placements[(x, current_height + 1, z)] = _block("dark_oak_log", axis="z")
+            elif on_z_edge:
+                placements[(x, current_height + 1, z)] = _block("dark_oak_log", axis="x")
+    
+    # Main foundation platform, with every cell's draws made up front
+    foundation_blocks = theme_blocks["foundation"]
+    platform_shape = (len(dx_range), len(dz_range))
+    any_picks = rng.integers(0, len(foundation_blocks), platform_shape)
+    prefer_primary = rng.random(platform_shape) < 0.7
+    other_picks = rng.integers(1, len(foundation_blocks), platform_shape)
+    for i, dx in enumerate(dx_range):
+        x = xaxis + dx
+        for j, dz in enumerate(dz_range):
             # Mix materials to create interesting pattern
             if (dx + dz) % 3 == 0:
-                material = get_random_block(theme_materials["foundation"])
+                material = foundation_blocks[any_picks[i, j]]
+            elif prefer_primary[i, j]:
+                # Prefer the primary material elsewhere
+                material = foundation_blocks[0]
             else:
-                material = get_weighted_random(theme_materials["foundation"])
+                material = foundation_blocks[other_picks[i, j]]
             
-            ED.placeBlock((xaxis + dx, y - 1, zaxis + dz), material)
+            placements[(x, y - 1, zaxis + dz)] = material
+    
+    return placements
 
-def build_floor(ED, xaxis, zaxis, y, width, length, theme_materials):
-    """Build the floor with complex patterns"""
-    print("Adding floor...")
+def build_foundation(ED, xaxis, zaxis, y, width, length, theme_materials, theme_blocks, adjustments, rng):
+    """Build the house foundation with enhanced terrain adaptation"""
+    apply_placements(ED, plan_foundation(xaxis, zaxis, y, width, length, theme_materials, theme_blocks, adjustments, rng))
+
+def plan_floor(xaxis, zaxis, y, width, length, theme_materials, theme_blocks, rng):
+    """Plan the floor with complex patterns, drawing from rng"""
+    print("Planning floor...")
+    placements = {}
     floor_materials = theme_materials["floor"]
+    floor_y = y - 1
+    dx_range = range(-width//2 + 1, width//2)
+    dz_range = range(-length//2 + 1, length//2)
     
     # Determine the pattern type
-    pattern_type = choice(["checkered", "herringbone", "bordered", "random"])
+    pattern_type = str(rng.choice(["checkered", "herringbone", "bordered", "random"]))
     
     if pattern_type == "checkered":
         # Simple checkerboard pattern
-        for dx in range(-width//2 + 1, width//2):
-            for dz in range(-length//2 + 1, length//2):
+        for dx in dx_range:
+            x = xaxis + dx
+            for dz in dz_range:
                 if (dx + dz) % 2 == 0:
-                    ED.placeBlock((xaxis + dx, y - 1, zaxis + dz), Block(floor_materials[0]))
+                    placements[(x, floor_y, zaxis + dz)] = _block(floor_materials[0])
                 else:
-                    ED.placeBlock((xaxis + dx, y - 1, zaxis + dz), Block(floor_materials[1]))
+                    placements[(x, floor_y, zaxis + dz)] = _block(floor_materials[1])
     
     elif pattern_type == "herringbone":
         # Herringbone pattern using blocks with directional textures
-        for dx in range(-width//2 + 1, width//2):
-            for dz in range(-length//2 + 1, length//2):
+        for dx in dx_range:
+            x = xaxis + dx
+            for dz in dz_range:
                 if (dx + dz) % 2 == 0:
-                    ED.placeBlock((xaxis + dx, y - 1, zaxis + dz), 
-                                 Block(floor_materials[0], {"axis": "x"}))
+                    placements[(x, floor_y, zaxis + dz)] = _block(floor_materials[0], axis="x")
                 else:
-                    ED.placeBlock((xaxis + dx, y - 1, zaxis + dz), 
-                                 Block(floor_materials[0], {"axis": "z"}))
+                    placements[(x, floor_y, zaxis + dz)] = _block(floor_materials[0], axis="z")
     
     elif pattern_type == "bordered":
         # Border with different material in center
-        for dx in range(-width//2 + 1, width//2):
-            for dz in range(-length//2 + 1, length//2):
-                if (abs(dx) >= width//2 - 2 or abs(dz) >= length//2 - 2):
+        border_dx = width//2 - 2
+        border_dz = length//2 - 2
+        for dx in dx_range:
+            x = xaxis + dx
+            in_x_border = abs(dx) >= border_dx
+            for dz in dz_range:
+                if in_x_border or abs(dz) >= border_dz:
                     # Border
-                    ED.placeBlock((xaxis + dx, y - 1, zaxis + dz), Block(floor_materials[0]))
+                    placements[(x, floor_y, zaxis + dz)] = _block(floor_materials[0])
                 else:
                     # Center
-                    ED.placeBlock((xaxis + dx, y - 1, zaxis + dz), Block(floor_materials[1]))
+                    placements[(x, floor_y, zaxis + dz)] = _block(floor_materials[1])
                     
         # Add corner accents
-        for dx in [-width//2 + 2, width//2 - 2]:
-            for dz in [-length//2 + 2, length//2 - 2]:
-                ED.placeBlock((xaxis + dx, y - 1, zaxis + dz), 
-                             Block(choice(theme_materials["accent"])))
+        accents = iter(random_blocks(theme_blocks["accent"], 4, rng))
+        for dx in [-width//2 + 2, border_dx]:
+            for dz in [-length//2 + 2, border_dz]:
+                placements[(xaxis + dx, floor_y, zaxis + dz)] = next(accents)
     
     else:  # random
-        # Random mix of materials for a natural worn look
-        for dx in range(-width//2 + 1, width//2):
-            for dz in range(-length//2 + 1, length//2):
-                if random() < 0.2:
-                    ED.placeBlock((xaxis + dx, y - 1, zaxis + dz), Block(floor_materials[1]))
-                else:
-                    ED.placeBlock((xaxis + dx, y - 1, zaxis + dz), Block(floor_materials[0]))
+        # Mix of materials for a natural worn look, about one in five blocks worn
+        floor_blocks = (_block(floor_materials[0]), _block(floor_materials[1]))
+        picks = (rng.random((len(dx_range), len(dz_range))) < 0.2).astype(np.int8)
+        for i, dx in enumerate(dx_range):
+            x = xaxis + dx
+            for j, dz in enumerate(dz_range):
+                placements[(x, floor_y, zaxis + dz)] = floor_blocks[picks[i, j]]
+    
+    return placements
 
-def build_walls(ED, xaxis, zaxis, y, width, length, height, theme_materials):
-    """Build walls with more sophisticated design"""
+def build_floor(ED, xaxis, zaxis, y, width, length, theme_materials, theme_blocks, rng):
+    """Build the floor with complex patterns"""
+    apply_placements(ED, plan_floor(xaxis, zaxis, y, width, length, theme_materials, theme_blocks, rng))
+
+def build_walls(ED, xaxis, zaxis, y, width, length, height, theme_materials, theme_blocks, rng):
+    """Build walls with more sophisticated design, drawing from rng"""
     print("Building walls...")
-    wall_materials = theme_materials["walls"]
     trim_materials = theme_materials["trim"]
     
+    # Wall offsets and coordinates are fixed for the whole house
+    x_min, x_max = -width//2, width//2
+    z_min, z_max = -length//2, length//2
+    west_x, east_x = xaxis + x_min, xaxis + x_max
+    north_z, south_z = zaxis + z_min, zaxis + z_max
+    top_y = y + height
+    mid_h = height // 2
+    
     # Frame construction with corner pillars
-    for dx in [-width//2, width//2]:
-        for dz in [-length//2, length//2]:
+    for cx in [west_x, east_x]:
+        for cz in [north_z, south_z]:
             geo.placeCuboid(
                 ED,
-                (xaxis + dx, y - 1, zaxis + dz),
-                (xaxis + dx, y + height, zaxis + dz),
-                Block(trim_materials[0], {"axis": "y"})
+                (cx, y - 1, cz),
+                (cx, top_y, cz),
+                _block(trim_materials[0], axis="y")
             )
     
     # Horizontal beams at top and middle
-    for h in [0, height // 2, height]:
-        for x in range(-width//2, width//2 + 1):
-            ED.placeBlock((xaxis + x, y + h, zaxis - length//2), 
-                         Block(trim_materials[0], {"axis": "x"}))
-            ED.placeBlock((xaxis + x, y + h, zaxis + length//2), 
-                         Block(trim_materials[0], {"axis": "x"}))
+    beam_x = _block(trim_materials[0], axis="x")
+    beam_z = _block(trim_materials[0], axis="z")
+    for h in [0, mid_h, height]:
+        beam_y = y + h
+        for x in range(x_min, x_max + 1):
+            ED.placeBlock((xaxis + x, beam_y, north_z), beam_x)
+            ED.placeBlock((xaxis + x, beam_y, south_z), beam_x)
             
-        for z in range(-length//2, length//2 + 1):
-            ED.placeBlock((xaxis - width//2, y + h, zaxis + z), 
-                         Block(trim_materials[0], {"axis": "z"}))
-            ED.placeBlock((xaxis + width//2, y + h, zaxis + z), 
-                         Block(trim_materials[0], {"axis": "z"}))
+        for z in range(z_min, z_max + 1):
+            ED.placeBlock((west_x, beam_y, zaxis + z), beam_z)
+            ED.placeBlock((east_x, beam_y, zaxis + z), beam_z)
     
     # Vertical beams
-    for x in range(-width//2 + 3, width//2, 3):
-        geo.placeCuboid(
-            ED,
-            (xaxis + x, y, zaxis - length//2),
-            (xaxis + x, y + height, zaxis - length//2),
-            Block(trim_materials[1], {"axis": "y"})
-        )
-        geo.placeCuboid(
-            ED,
-            (xaxis + x, y, zaxis + length//2),
-            (xaxis + x, y + height, zaxis + length//2),
-            Block(trim_materials[1], {"axis": "y"})
-        )
-    
-    for z in range(-length//2 + 3, length//2, 3):
-        geo.placeCuboid(
-            ED,
-            (xaxis - width//2, y, zaxis + z),
-            (xaxis - width//2, y + height, zaxis + z),
-            Block(trim_materials[1], {"axis": "y"})
-        )
-        geo.placeCuboid(
-            ED,
-            (xaxis + width//2, y, zaxis + z),
-            (xaxis + width//2, y + height, zaxis + z),
-            Block(trim_materials[1], {"axis": "y"})
-        )
-    
-    # Fill walls between the frame
-    for h in range(height):
-        for x in range(-width//2, width//2 + 1):
-            for z in [-length//2, length//2]:
-                # Skip if it's a beam position
-                if (h == 0 or h == height // 2 or h == height) or \
-                   (x == -width//2 or x == width//2) or \
-                   (x % 3 == 0 and x != 0):
-                    continue
-                
-                # Choose wall material
-                if (x % 4 == 0 and h % 3 == 0) or (z % 4 == 0 and h % 3 == 0):
-                    # Add some pattern/texture variation
-                    material = Block(choice(theme_materials["accent"]))
-                else:
-                    material = get_random_block(wall_materials)
-                
-                ED.placeBlock((xaxis + x, y + h, zaxis + z), material)
-        
-        for z in range(-length//2, length//2 + 1):
-            for x in [-width//2, width//2]:
-                # Skip if it's a beam position
-                if (h == 0 or h == height // 2 or h == height) or \
-                   (z == -length//2 or z == length//2) or \
-                   (z % 3 == 0 and z != 0):
-                    continue
-                
-                # Choose wall material
-                if (z % 4 == 0 and h % 3 == 0) or (x % 4 == 0 and h % 3 == 0):
-                    # Add some pattern/texture variation
-                    material = Block(choice(theme_materials["accent"]))
-                else:
-                    material = get_random_block(wall_materials)
-                
-                ED.placeBlock((xaxis + x, y + h, zaxis + z), material)
+    post = _block(trim_materials[1], axis="y")
+    for x in range(x_min + 3, x_max, 3):
+        geo.placeCuboid(ED, (xaxis + x, y, north_z), (xaxis + x, top_y, north_z), post)
+        geo.placeCuboid(ED, (xaxis + x, y, south_z), (xaxis + x, top_y, south_z), post)
+    
+    for z in range(z_min + 3, z_max, 3):
+        geo.placeCuboid(ED, (west_x, y, zaxis + z), (west_x, top_y, zaxis + z), post)
+        geo.placeCuboid(ED, (east_x, y, zaxis + z), (east_x, top_y, zaxis + z), post)
+    
+    # Walk the perimeter as one list of wall cells, leaving out the corner and vertical beam columns
+    fill_xs = [x for x in range(x_min + 1, x_max) if x % 3 != 0 or x == 0]
+    fill_zs = [z for z in range(z_min + 1, z_max) if z % 3 != 0 or z == 0]
+    perimeter = [(x, z) for x in fill_xs for z in (z_min, z_max)] + \
+                [(x, z) for z in fill_zs for x in (x_min, x_max)]
+    px, pz = np.array(perimeter).T
+    hs = np.arange(height)
+    
+    # Pick the fill material of every wall cell up front in one batch of draws.
+    # Accents go where h % 3 == 0 and either coordinate is a multiple of 4.
+    wall_blocks = theme_blocks["walls"]
+    accent_blocks = theme_blocks["accent"]
+    palette = wall_blocks + accent_blocks
+    accent = (hs % 3 == 0)[:, None] & ((px % 4 == 0) | (pz % 4 == 0))[None, :]
+    wall_shape = (height, len(perimeter))
+    picks = np.where(accent,
+                     len(wall_blocks) + rng.integers(0, len(accent_blocks), wall_shape),
+                     rng.integers(0, len(wall_blocks), wall_shape))
+    
+    # Fill walls between the frame, skipping the beam rows
+    fill_rows = [h for h in range(height) if h != 0 and h != mid_h]
+    for h in fill_rows:
+        fill_y = y + h
+        for i, (x, z) in enumerate(perimeter):
+            ED.placeBlock((xaxis + x, fill_y, zaxis + z), palette[picks[h, i]])
 
-def build_roof(ED, xaxis, zaxis, y, width, length, height, theme_materials, style="pitched"):
-    """Build a more complex roof"""
+def build_roof(ED, xaxis, zaxis, y, width, length, height, theme_materials, theme_blocks, rng, style="pitched"):
+    """Build a more complex roof, drawing from rng"""
     print(f"Building {style} roof...")
     
     # Get trim materials from theme_materials
@@ -424,119 +557,134 @@ def build_roof(ED, xaxis, zaxis, y, width, length, height, theme_materials, styl
         # Advanced pitched roof with eaves
         eaves_extension = 1
         
+        # Offsets of the eaves outline and the roof base level are fixed for the whole roof
+        eaves_x_min = -width//2 - eaves_extension
+        eaves_x_max = width//2 + eaves_extension
+        eaves_z_range = range(-length//2 - eaves_extension, length//2 + eaves_extension + 1)
+        base_y = y + height - 1
+        
         # Extended base for eaves
-        for dx in range(-width//2 - eaves_extension, width//2 + eaves_extension + 1):
-            for dz in range(-length//2 - eaves_extension, length//2 + eaves_extension + 1):
+        eaves_block = _block(trim_materials[0], axis="y")
+        for dx in range(eaves_x_min, eaves_x_max + 1):
+            x = xaxis + dx
+            in_interior_x = -width//2 < dx < width//2
+            for dz in eaves_z_range:
                 # Skip if it's the actual open interior
-                if -width//2 < dx < width//2 and -length//2 < dz < length//2:
+                if in_interior_x and -length//2 < dz < length//2:
                     continue
                 
                 # Base of eaves
-                ED.placeBlock(
-                    (xaxis + dx, y + height - 1, zaxis + dz),
-                    Block(trim_materials[0], {"axis": "y"})
-                )
+                ED.placeBlock((x, base_y, zaxis + dz), eaves_block)
         
         # Roof slopes with eaves
         max_height = width//2 + 2
+        west_stair = _block(theme_materials["roof"][0], facing="east")
+        east_stair = _block(theme_materials["roof"][0], facing="west")
+        roof_fill = _block(theme_materials["roof"][1])
+        z_min = zaxis + eaves_z_range[0]
+        z_max = zaxis + eaves_z_range[-1]
         for i in range(max_height + 1):
             # Determine current y level
-            current_y = y + height - 1 + i
+            current_y = base_y + i
             current_width = width - (i * 2) + (eaves_extension * 2)
+            west_dx = eaves_x_min + i
+            east_dx = eaves_x_max - i
             
-            # Across the length of the house (long horizontal direction)
-            for dz in range(-length//2 - eaves_extension, length//2 + eaves_extension + 1):
-                if i == max_height:  # Center ridge beam
-                    ED.placeBlock(
-                        (xaxis, current_y, zaxis + dz),
-                        get_random_block(theme_materials["accent"])
-                    )
-                else:
-                    # West-facing side (negative x)
-                    west_dx = -width//2 + i - eaves_extension
-                    ED.placeBlock(
-                        (xaxis + west_dx, current_y, zaxis + dz),
-                        Block(theme_materials["roof"][0], {"facing": "east"})
-                    )
-                    
-                    # East-facing side (positive x)
-                    east_dx = width//2 - i + eaves_extension
-                    ED.placeBlock(
-                        (xaxis + east_dx, current_y, zaxis + dz),
-                        Block(theme_materials["roof"][0], {"facing": "west"})
+            # Each row runs the length of the house (long horizontal direction)
+            if i == max_height:  # Center ridge beam
+                geo.placeCuboid(ED, (xaxis, current_y, z_min), (xaxis, current_y, z_max), theme_blocks["accent"])
+            else:
+                # West-facing side (negative x)
+                geo.placeCuboid(ED, (xaxis + west_dx, current_y, z_min), (xaxis + west_dx, current_y, z_max), west_stair)
+                
+                # East-facing side (positive x)
+                geo.placeCuboid(ED, (xaxis + east_dx, current_y, z_min), (xaxis + east_dx, current_y, z_max), east_stair)
+                
+                # Fill the inside with solid blocks, only for non-ground levels
+                if i > 0 and west_dx + 1 < east_dx:
+                    geo.placeCuboid(
+                        ED,
+                        (xaxis + west_dx + 1, current_y, z_min),
+                        (xaxis + east_dx - 1, current_y, z_max),
+                        roof_fill
                     )
-                    
-                    # Fill the inside with solid blocks
-                    for fill_dx in range(west_dx + 1, east_dx):
-                        if i > 0:  # Only fill interior for non-ground level
-                            ED.placeBlock(
-                                (xaxis + fill_dx, current_y, zaxis + dz),
-                                Block(theme_materials["roof"][1])
-                            )
             
         # Add decorative gables at the front and back
-        for z in [-length//2 - eaves_extension, length//2 + eaves_extension]:
+        for z in [eaves_z_range[0], eaves_z_range[-1]]:
+            gable_z = zaxis + z
             for i in range(max_height):
-                current_y = y + height - 1 + i
+                current_y = base_y + i
+                left_dx = eaves_x_min + i
+                right_dx = eaves_x_max - i
+                is_frame_row = i == 0 or i == max_height - 1
                 
-                # Draw a triangular pattern
-                for dx in range(-width//2 - eaves_extension + i, width//2 + eaves_extension + 1 - i):
+                # Draw a triangular pattern, with a frame and a fill pick drawn for every cell of the row
+                frame_picks = random_blocks(theme_blocks["trim"], right_dx - left_dx + 1, rng)
+                fill_picks = random_blocks(theme_blocks["walls"], right_dx - left_dx + 1, rng)
+                for k, dx in enumerate(range(left_dx, right_dx + 1)):
                     # Use different materials for added detail
-                    if i == 0 or i == max_height - 1 or dx == -width//2 - eaves_extension + i or dx == width//2 + eaves_extension - i:
+                    if is_frame_row or dx == left_dx or dx == right_dx:
                         # Frame
-                        material = get_random_block(theme_materials["trim"])
+                        material = frame_picks[k]
                     else:
                         # Fill
-                        material = get_random_block(theme_materials["walls"])
+                        material = fill_picks[k]
                     
-                    ED.placeBlock((xaxis + dx, current_y, zaxis + z), material)
+                    ED.placeBlock((xaxis + dx, current_y, gable_z), material)
         
         # Add decorative chimney
         chimney_x = xaxis + width//2 - 2
         chimney_z = zaxis + length//3
         chimney_height = max_height + 2
+        chimney_y = y + height
         
-        for h in range(chimney_height):
-            ED.placeBlock(
-                (chimney_x, y + height + h, chimney_z),
-                get_random_block(theme_materials["accent"])
-            )
+        # A sequence of blocks makes gdpc pick a random accent for each block of the column
+        geo.placeCuboid(
+            ED,
+            (chimney_x, chimney_y, chimney_z),
+            (chimney_x, chimney_y + chimney_height - 1, chimney_z),
+            theme_blocks["accent"]
+        )
         
         # Chimney top
         ED.placeBlock(
-            (chimney_x, y + height + chimney_height, chimney_z),
-            Block("campfire", {"lit": "true"})
+            (chimney_x, chimney_y + chimney_height, chimney_z),
+            B_CAMPFIRE_LIT
         )
         
         # Surround chimney top with decorative blocks
-        for dx in range(-1, 2):
-            for dz in range(-1, 2):
-                if dx == 0 and dz == 0:
-                    continue
-                ED.placeBlock(
-                    (chimney_x + dx, y + height + chimney_height - 1, chimney_z + dz),
-                    Block("cobblestone_wall")
-                )
+        for dx, dz in RING_OFFSETS:
+            ED.placeBlock(
+                (chimney_x + dx, chimney_y + chimney_height - 1, chimney_z + dz),
+                _block("cobblestone_wall")
+            )
     
     elif style == "dome":
         # Create a dome roof
         roof_height = width // 2
         radius = width // 2 + 1
         
-        for dy in range(roof_height + 1):
-            circle_radius = int(math.sqrt(radius**2 - dy**2))
-            for dx in range(-circle_radius, circle_radius + 1):
-                for dz in range(-length//2, length//2 + 1):
-                    # Only place blocks for the dome surface
-                    if int(math.sqrt(dx**2 + ((dz/2)**2))) == circle_radius:
-                        ED.placeBlock(
-                            (xaxis + dx, y + height + dy, zaxis + dz),
-                            get_random_block(theme_materials["accent"])
-                        )
+        # Distance of every (dx, dz) column from the dome axis, computed once
+        dxs = np.arange(-radius, radius + 1)
+        dzs = np.arange(-length//2, length//2 + 1)
+        column_dist = np.sqrt(dxs[:, None]**2 + (dzs[None, :] / 2)**2).astype(int)
+        circle_radii = np.sqrt(radius**2 - np.arange(roof_height + 1)**2).astype(int)
+        
+        for dy, circle_radius in enumerate(circle_radii):
+            # Only place blocks for the dome surface
+            shell = (column_dist == circle_radius) & (np.abs(dxs) <= circle_radius)[:, None]
+            positions = [
+                (xaxis + int(dxs[i]), y + height + dy, zaxis + int(dzs[j]))
+                for i, j in np.argwhere(shell)
+            ]
+            # gdpc picks an accent block per position
+            if positions:
+                ED.placeBlock(positions, theme_blocks["accent"])
 
-def add_windows(ED, xaxis, zaxis, y, width, length, height, theme_materials):
-    """Add detailed windows to the house"""
-    print("Adding windows...")
+def plan_windows(xaxis, zaxis, y, width, length, height, theme_materials, rng):
+    """Plan detailed windows for the house, drawing from rng"""
+    print("Planning windows...")
+    placements = {}
     
     # Windows with decorative frames
     window_positions = [
@@ -549,160 +697,78 @@ def add_windows(ED, xaxis, zaxis, y, width, length, height, theme_materials):
         (xaxis - width//3, zaxis - length//2), (xaxis + width//3, zaxis - length//2)
     ]
     
-    for wx, wz in window_positions:
-        # Determine window orientation
-        is_side = (wx == xaxis + width//2 or wx == xaxis - width//2)
-        
-        # Set the facing direction for decorative blocks
-        if wx == xaxis + width//2:
-            facing = "west"
-        elif wx == xaxis - width//2:
-            facing = "east"
-        elif wz == zaxis + length//2:
-            facing = "north"
-        else:
-            facing = "south"
-            
-        # First, create the window frame
-        frame_material = Block(theme_materials["trim"][1])
-        
-        # Create window shape based on style
-        window_style = choice(["tall", "wide", "arched", "square"])
-        
-        if window_style == "tall":
-            # Tall window
-            window_height = 3
-            window_width = 1
-            
-            start_y = y + 1
-            
-            # Build the window frame
-            for dy in range(-1, window_height + 1):
-                for dx in range(-1, window_width + 1):
-                    # Determine position based on orientation
-                    if is_side:
-                        pos = (wx, start_y + dy, wz + dx)
-                    else:
-                        pos = (wx + dx, start_y + dy, wz)
-                    
-                    # If it's the frame edge, place frame material
-                    if dy == -1 or dy == window_height or dx == -1 or dx == window_width:
-                        ED.placeBlock(pos, frame_material)
-                    else:
-                        # Inside the frame, place the glass
-                        ED.placeBlock(pos, Block(theme_materials["windows"][0]))
-                
-            # Add window decoration
-            if is_side:
-                # Add flower box
-                ED.placeBlock((wx, start_y - 1, wz), 
-                             Block("spruce_trapdoor", {"facing": facing, "half": "top"}))
-                # Add a flower
-                ED.placeBlock((wx - (1 if facing == "east" else -1), start_y - 1, wz), 
-                             Block("potted_red_tulip"))
-            else:
-                # Add awning
-                ED.placeBlock((wx, start_y + window_height, wz - (1 if facing == "south" else -1)), 
-                             Block("spruce_trapdoor", {"facing": facing, "half": "top"}))
+    frame_material = _block(theme_materials["trim"][1])
+    glass_material = _block(theme_materials["windows"][0])
+    start_y = y + 1
+    
+    # Pick every window's style up front, then build the windows one style at a time
+    window_styles = rng.choice(len(WINDOW_STYLES), size=len(window_positions))
+    
+    for style_index, window_style in enumerate(WINDOW_STYLES):
+        stencil = WINDOW_STENCILS[window_style]
         
-        elif window_style == "wide":
-            # Wide window
-            window_height = 2
-            window_width = 2
+        for (wx, wz), picked in zip(window_positions, window_styles):
+            if picked != style_index:
+                continue
             
-            start_y = y + 1
+            # Determine window orientation
+            is_side = (wx == xaxis + width//2 or wx == xaxis - width//2)
             
-            # Build the window frame
-            for dy in range(-1, window_height + 1):
-                for dx in range(-1, window_width + 1):
-                    # Determine position based on orientation
-                    if is_side:
-                        pos = (wx, start_y + dy, wz + dx)
-                    else:
-                        pos = (wx + dx, start_y + dy, wz)
-                    
-                    # If it's the frame edge or center divider, place frame material
-                    if dy == -1 or dy == window_height or dx == -1 or dx == window_width:
-                        ED.placeBlock(pos, frame_material)
-                    else:
-                        # Inside the frame, place the glass
-                        ED.placeBlock(pos, Block(theme_materials["windows"][0]))
-            
-            # Add decorations
-            if is_side:
-                # Add shutters
-                ED.placeBlock((wx, start_y, wz - 1), 
-                             Block("spruce_trapdoor", {"facing": "north", "open": "true"}))
-                ED.placeBlock((wx, start_y, wz + window_width + 1), 
-                             Block("spruce_trapdoor", {"facing": "south", "open": "true"}))
+            # Set the facing direction for decorative blocks
+            if wx == xaxis + width//2:
+                facing = "west"
+            elif wx == xaxis - width//2:
+                facing = "east"
+            elif wz == zaxis + length//2:
+                facing = "north"
             else:
-                # Add shutters
-                ED.placeBlock((wx - 1, start_y, wz), 
-                             Block("spruce_trapdoor", {"facing": "west", "open": "true"}))
-                ED.placeBlock((wx + window_width + 1, start_y, wz), 
-                             Block("spruce_trapdoor", {"facing": "east", "open": "true"}))
-        
-        elif window_style == "arched":
-            # Arched window
-            window_height = 3
-            window_width = 1
+                facing = "south"
             
-            start_y = y + 1
+            # Build the frame and glass from the style's stencil, running along z on side walls
+            step_x, step_z = (0, 1) if is_side else (1, 0)
+            for dy, dx, is_frame in stencil:
+                pos = (wx + step_x * dx, start_y + dy, wz + step_z * dx)
+                placements[pos] = frame_material if is_frame else glass_material
             
-            # Build the window frame
-            for dy in range(window_height + 1):
-                for dx in range(-1, window_width + 1):
-                    # Determine position based on orientation
-                    if is_side:
-                        pos = (wx, start_y + dy, wz + dx)
-                    else:
-                        pos = (wx + dx, start_y + dy, wz)
-                    
-                    # If it's the frame edge or top arch, place frame material
-                    if dx == -1 or dx == window_width or (dy == window_height and dx >= 0 and dx < window_width):
-                        ED.placeBlock(pos, frame_material)
-                    elif dy < window_height:
-                        # Inside the frame, place the glass
-                        ED.placeBlock(pos, Block(theme_materials["windows"][0]))
-            
-            # Add decorative stained glass on top
-            if is_side:
-                ED.placeBlock((wx, start_y + window_height - 1, wz), Block("yellow_stained_glass"))
-            else:
-                ED.placeBlock((wx, start_y + window_height - 1, wz), Block("yellow_stained_glass"))
-        
-        else:  # square
-            # Square window
-            window_size = 1
-            
-            start_y = y + 1
+            if window_style == "tall":
+                window_height = 3
+                
+                # Add window decoration
+                if is_side:
+                    # Add flower box
+                    placements[(wx, start_y - 1, wz)] = _block("spruce_trapdoor", facing=facing, half="top")
+                    # Add a flower
+                    placements[(wx - (1 if facing == "east" else -1), start_y - 1, wz)] = _block("potted_red_tulip")
+                else:
+                    # Add awning
+                    placements[(wx, start_y + window_height, wz - (1 if facing == "south" else -1))] = _block("spruce_trapdoor", facing=facing, half="top")
             
-            # Build the window frame
-            for dy in range(window_size):
-                for dx in range(window_size):
-                    # Determine position based on orientation
-                    if is_side:
-                        ED.placeBlock((wx, start_y + dy, wz + dx), Block(theme_materials["windows"][0]))
-                    else:
-                        ED.placeBlock((wx + dx, start_y + dy, wz), Block(theme_materials["windows"][0]))
-                        
-            # Simple wood frame
-            if is_side:
-                for dx in range(-1, window_size + 1):
-                    ED.placeBlock((wx, start_y - 1, wz + dx), frame_material)
-                    ED.placeBlock((wx, start_y + window_size, wz + dx), frame_material)
+            elif window_style == "wide":
+                window_width = 2
                 
-                ED.placeBlock((wx, start_y, wz - 1), frame_material)
-                ED.placeBlock((wx, start_y, wz + window_size), frame_material)
-            else:
-                for dx in range(-1, window_size + 1):
-                    ED.placeBlock((wx + dx, start_y - 1, wz), frame_material)
-                    ED.placeBlock((wx + dx, start_y + window_size, wz), frame_material)
+                # Add decorations
+                if is_side:
+                    # Add shutters
+                    placements[(wx, start_y, wz - 1)] = _block("spruce_trapdoor", facing="north", open="true")
+                    placements[(wx, start_y, wz + window_width + 1)] = _block("spruce_trapdoor", facing="south", open="true")
+                else:
+                    # Add shutters
+                    placements[(wx - 1, start_y, wz)] = _block("spruce_trapdoor", facing="west", open="true")
+                    placements[(wx + window_width + 1, start_y, wz)] = _block("spruce_trapdoor", facing="east", open="true")
+            
+            elif window_style == "arched":
+                window_height = 3
                 
-                ED.placeBlock((wx - 1, start_y, wz), frame_material)
-                ED.placeBlock((wx + window_size, start_y, wz), frame_material)
+                # Add decorative stained glass on top
+                placements[(wx, start_y + window_height - 1, wz)] = _block("yellow_stained_glass")
+    
+    return placements
+
+def add_windows(ED, xaxis, zaxis, y, width, length, height, theme_materials, rng):
+    """Add detailed windows to the house"""
+    apply_placements(ED, plan_windows(xaxis, zaxis, y, width, length, height, theme_materials, rng))
 
-def add_door(ED, xaxis, zaxis, y, width, length, theme_materials):
+def add_door(ED, xaxis, zaxis, y, width, length, theme_materials, theme_blocks):
     """Add a detailed door with porch area"""
     print("Adding door...")
     
@@ -713,82 +779,93 @@ def add_door(ED, xaxis, zaxis, y, width, length, theme_materials):
     # Door material based on theme
     door_material = "spruce_door"
     
+    # Single blocks are collected and sent as one batch at the end
+    placements = {}
+    
     # Create door frame
-    ED.placeBlock((door_x, y, door_z), Block(door_material, {"facing": "east", "half": "lower"}))
-    ED.placeBlock((door_x, y + 1, door_z), Block(door_material, {"facing": "east", "half": "upper"}))
+    placements[(door_x, y, door_z)] = _block(door_material, facing="east", half="lower")
+    placements[(door_x, y + 1, door_z)] = _block(door_material, facing="east", half="upper")
     
     # Add framing around door
     for dy in range(3):
-        ED.placeBlock((door_x, y + dy, door_z - 1), Block(theme_materials["trim"][1]))
-        ED.placeBlock((door_x, y + dy, door_z + 1), Block(theme_materials["trim"][1]))
+        placements[(door_x, y + dy, door_z - 1)] = _block(theme_materials["trim"][1])
+        placements[(door_x, y + dy, door_z + 1)] = _block(theme_materials["trim"][1])
     
     # Top of door frame
-    ED.placeBlock((door_x, y + 2, door_z), Block(theme_materials["trim"][1], {"axis": "z"}))
+    placements[(door_x, y + 2, door_z)] = _block(theme_materials["trim"][1], axis="z")
     
     # Add porch area
     porch_width = 5
     porch_depth = 3
     
     # Porch floor
-    for dx in range(1, porch_depth + 1):
-        for dz in range(-porch_width//2, porch_width//2 + 1):
-            ED.placeBlock(
-                (door_x - dx, y - 1, door_z + dz),
-                get_random_block(theme_materials["floor"])
-            )
+    geo.placeCuboid(
+        ED,
+        (door_x - porch_depth, y - 1, door_z + (-porch_width//2)),
+        (door_x - 1, y - 1, door_z + porch_width//2),
+        theme_blocks["floor"]
+    )
     
     # Porch steps
     for dx in range(1, 3):
         for dz in range(-porch_width//2 + 1, porch_width//2):
-            ED.placeBlock(
-                (door_x - porch_depth - dx, y - dx, door_z + dz),
-                Block("spruce_stairs", {"facing": "east"})
-            )
+            placements[(door_x - porch_depth - dx, y - dx, door_z + dz)] = STAIRS["east"]
     
     # Porch railings
     for dz in range(-porch_width//2, porch_width//2 + 1):
         if dz != 0:  # Skip the entrance
-            ED.placeBlock((door_x - porch_depth, y, door_z + dz), Block("spruce_fence"))
+            placements[(door_x - porch_depth, y, door_z + dz)] = B_FENCE
             
     for dx in range(-porch_depth, 0):
-        ED.placeBlock((door_x + dx, y, door_z - porch_width//2), Block("spruce_fence"))
-        ED.placeBlock((door_x + dx, y, door_z + porch_width//2), Block("spruce_fence"))
+        placements[(door_x + dx, y, door_z - porch_width//2)] = B_FENCE
+        placements[(door_x + dx, y, door_z + porch_width//2)] = B_FENCE
     
     # Porch roof
-    for dx in range(1, porch_depth + 1):
-        for dz in range(-porch_width//2 - 1, porch_width//2 + 2):
-            ED.placeBlock(
-                (door_x - dx, y + 3, door_z + dz),
-                get_random_block(theme_materials["floor"])
-            )
+    geo.placeCuboid(
+        ED,
+        (door_x - porch_depth, y + 3, door_z + (-porch_width//2 - 1)),
+        (door_x - 1, y + 3, door_z + porch_width//2 + 1),
+        theme_blocks["floor"]
+    )
     
     # Porch support pillars
+    pillar = _block(theme_materials["trim"][0])
     for dz in [-porch_width//2, porch_width//2]:
-        geo.placeCuboid(
-            ED,
-            (door_x - porch_depth, y, door_z + dz),
-            (door_x - porch_depth, y + 2, door_z + dz),
-            Block(theme_materials["trim"][0])
-        )
+        for dy in range(3):
+            placements[(door_x - porch_depth, y + dy, door_z + dz)] = pillar
     
     # Add decorative items to porch
     # Lanterns on pillars
-    ED.placeBlock((door_x - porch_depth, y + 2, door_z - porch_width//2), Block("lantern"))
-    ED.placeBlock((door_x - porch_depth, y + 2, door_z + porch_width//2), Block("lantern"))
+    placements[(door_x - porch_depth, y + 2, door_z - porch_width//2)] = B_LANTERN
+    placements[(door_x - porch_depth, y + 2, door_z + porch_width//2)] = B_LANTERN
     
     # Add a welcome mat
-    ED.placeBlock((door_x - 1, y - 1, door_z), Block("brown_carpet"))
+    placements[(door_x - 1, y - 1, door_z)] = _block("brown_carpet")
     
     # Add a bench on the porch
-    ED.placeBlock((door_x - 2, y, door_z - porch_width//2 + 1), Block("spruce_stairs", {"facing": "south"}))
-    ED.placeBlock((door_x - 2, y, door_z - porch_width//2 + 2), Block("spruce_stairs", {"facing": "north"}))
+    placements[(door_x - 2, y, door_z - porch_width//2 + 1)] = STAIRS["south"]
+    placements[(door_x - 2, y, door_z - porch_width//2 + 2)] = STAIRS["north"]
+    
+    apply_placements(ED, placements)
 
-def add_interior_details(ED, xaxis, zaxis, y, width, length, height, theme_materials):
-    """Add detailed interior decorations"""
+def add_interior_details(ED, xaxis, zaxis, y, width, length, height, theme_materials, theme_blocks, rng):
+    """Add detailed interior decorations, drawing from rng"""
     print("Adding interior details...")
     
+    # Loop-invariant offsets. (-width)//2 rounds down, so the west/north edges get their own names
+    hw, hl = width//2, length//2
+    qw, ql = width//4, length//4
+    west, north = -width//2, -length//2
+    north_q = -length//4
+    place = ED.placeBlock
+    wall_blocks = theme_blocks["walls"]
+    
     # Create interior walls to divide the space
-    interior_wall_layout = choice(["open", "divided", "rooms"])
+    interior_wall_layout = str(rng.choice(["open", "divided", "rooms"]))
+    has_bedroom = interior_wall_layout in {"divided", "rooms"}
+    
+    # Enough wall blocks for the longest divider layout, drawn in one go
+    wall_picks = iter(random_blocks(wall_blocks, (width + length) * height, rng))
     
     if interior_wall_layout == "open":
         # Open floor plan - just add details
@@ -796,100 +873,96 @@ def add_interior_details(ED, xaxis, zaxis, y, width, length, height, theme_mater
     
     elif interior_wall_layout == "divided":
         # Add a central dividing wall
-        for dz in range(-length//2 + 2, length//2 - 1):
+        for dz in range(north + 2, hl - 1):
             for dy in range(height - 1):
                 # Leave a doorway
                 if dz == 0:
                     if dy < 2:
                         continue
-                ED.placeBlock((xaxis, y + dy, zaxis + dz), get_random_block(theme_materials["walls"]))
+                place((xaxis, y + dy, zaxis + dz), next(wall_picks))
     
     elif interior_wall_layout == "rooms":
         # Create multiple room divisions
         
         # Main hall divider
-        for dx in range(-width//2 + 3, width//2 - 2):
+        for dx in range(west + 3, hw - 2):
             for dy in range(height - 1):
                 # Leave doorways
-                if dx == 0 or dx == -(width//4):
+                if dx == 0 or dx == -qw:
                     if dy < 2:
                         continue
-                ED.placeBlock((xaxis + dx, y + dy, zaxis), get_random_block(theme_materials["walls"]))
+                place((xaxis + dx, y + dy, zaxis), next(wall_picks))
         
         # Side room dividers
-        for dz in range(1, length//2 - 1):
+        for dz in range(1, hl - 1):
             for dy in range(height - 1):
-                if dy < 2 and dz == length//4:
+                if dy < 2 and dz == ql:
                     continue
-                ED.placeBlock((xaxis - width//4, y + dy, zaxis + dz), get_random_block(theme_materials["walls"]))
+                place((xaxis - qw, y + dy, zaxis + dz), next(wall_picks))
                 
-        for dz in range(-length//2 + 2, 0):
+        for dz in range(north + 2, 0):
             for dy in range(height - 1):
-                if dy < 2 and dz == -length//4:
+                if dy < 2 and dz == north_q:
                     continue
-                ED.placeBlock((xaxis + width//4, y + dy, zaxis + dz), get_random_block(theme_materials["walls"]))
+                place((xaxis + qw, y + dy, zaxis + dz), next(wall_picks))
     
     # Add a fireplace
-    fireplace_x = xaxis + width//2 - 1
+    fireplace_x = xaxis + hw - 1
     fireplace_z = zaxis
     
-    # Fireplace base
-    for dz in range(-1, 2):
-        ED.placeBlock((fireplace_x, y - 1, zaxis + dz), Block("cobblestone"))
-        geo.placeCuboid(
-            ED,
-            (fireplace_x, y, zaxis + dz),
-            (fireplace_x, y + 2, zaxis + dz),
-            Block("cobblestone")
-        )
+    # Fireplace base and body
+    geo.placeCuboid(ED, (fireplace_x, y - 1, zaxis - 1), (fireplace_x, y - 1, zaxis + 1), B_COBBLE)
+    geo.placeCuboid(ED, (fireplace_x, y, zaxis - 1), (fireplace_x, y + 2, zaxis + 1), B_COBBLE)
     
-    # Fireplace opening and fire
-    ED.placeBlock((fireplace_x, y, zaxis), Block("air"))
-    ED.placeBlock((fireplace_x, y + 1, zaxis), Block("air"))
-    ED.placeBlock((fireplace_x, y, zaxis), Block("campfire", {"lit": "true"}))
+    # Fireplace opening and fire; the campfire replaces the bottom cobblestone directly
+    place((fireplace_x, y + 1, zaxis), B_AIR)
+    place((fireplace_x, y, zaxis), B_CAMPFIRE_LIT)
     
     # Chimney mantel
-    ED.placeBlock((fireplace_x, y + 2, zaxis - 1), Block("spruce_stairs", {"facing": "south"}))
-    ED.placeBlock((fireplace_x, y + 2, zaxis + 1), Block("spruce_stairs", {"facing": "north"}))
-    ED.placeBlock((fireplace_x, y + 2, zaxis), Block("spruce_planks"))
+    place((fireplace_x, y + 2, zaxis - 1), STAIRS["south"])
+    place((fireplace_x, y + 2, zaxis + 1), STAIRS["north"])
+    place((fireplace_x, y + 2, zaxis), _block("spruce_planks"))
     
     # Add some decorative items on the mantel
-    ED.placeBlock((fireplace_x - 1, y + 3, zaxis - 1), Block("flower_pot"))
-    ED.placeBlock((fireplace_x - 1, y + 3, zaxis + 1), Block("lantern"))
+    place((fireplace_x - 1, y + 3, zaxis - 1), _block("flower_pot"))
+    place((fireplace_x - 1, y + 3, zaxis + 1), B_LANTERN)
     
     # Add living area with seating around fireplace
-    ED.placeBlock((fireplace_x - 2, y, zaxis - 2), Block("spruce_stairs", {"facing": "south"}))
-    ED.placeBlock((fireplace_x - 2, y, zaxis - 3), Block("spruce_stairs", {"facing": "east"}))
-    ED.placeBlock((fireplace_x - 3, y, zaxis - 3), Block("spruce_stairs", {"facing": "north"}))
+    place((fireplace_x - 2, y, zaxis - 2), STAIRS["south"])
+    place((fireplace_x - 2, y, zaxis - 3), STAIRS["east"])
+    place((fireplace_x - 3, y, zaxis - 3), STAIRS["north"])
     
-    ED.placeBlock((fireplace_x - 2, y, zaxis + 2), Block("spruce_stairs", {"facing": "north"}))
-    ED.placeBlock((fireplace_x - 2, y, zaxis + 3), Block("spruce_stairs", {"facing": "east"}))
-    ED.placeBlock((fireplace_x - 3, y, zaxis + 3), Block("spruce_stairs", {"facing": "south"}))
+    place((fireplace_x - 2, y, zaxis + 2), STAIRS["north"])
+    place((fireplace_x - 2, y, zaxis + 3), STAIRS["east"])
+    place((fireplace_x - 3, y, zaxis + 3), STAIRS["south"])
     
     # Add a table in the center
-    ED.placeBlock((fireplace_x - 4, y, zaxis), Block("spruce_fence"))
-    ED.placeBlock((fireplace_x - 4, y + 1, zaxis), Block("spruce_pressure_plate"))
+    place((fireplace_x - 4, y, zaxis), B_FENCE)
+    place((fireplace_x - 4, y + 1, zaxis), _block("spruce_pressure_plate"))
     
     # Add bedroom features
-    if interior_wall_layout == "rooms" or interior_wall_layout == "divided":
+    if has_bedroom:
         # Bed
-        bed_x = xaxis - width//2 + 2
+        bed_x = xaxis - hw + 2
         bed_z = zaxis + length//3
         
-        ED.placeBlock((bed_x, y, bed_z), Block("red_bed", {"facing": "west", "part": "foot"}))
-        ED.placeBlock((bed_x + 1, y, bed_z), Block("red_bed", {"facing": "west", "part": "head"}))
+        place((bed_x, y, bed_z), _block("red_bed", facing="west", part="foot"))
+        place((bed_x + 1, y, bed_z), _block("red_bed", facing="west", part="head"))
         
         # Nightstand
-        ED.placeBlock((bed_x, y, bed_z + 1), Block("spruce_planks"))
-        ED.placeBlock((bed_x, y + 1, bed_z + 1), Block("lantern"))
+        place((bed_x, y, bed_z + 1), _block("spruce_planks"))
+        place((bed_x, y + 1, bed_z + 1), B_LANTERN)
         
         # Chest at foot of bed
-        ED.placeBlock((bed_x - 1, y, bed_z), Block("chest", {"facing": "east"}))
+        place((bed_x - 1, y, bed_z), _block("chest", facing="east"))
         
         # Carpet
-        for dx in range(3):
-            for dz in range(3):
-                ED.placeBlock((bed_x - 1 + dx, y - 1, bed_z - 1 + dz), Block("light_gray_carpet"))
+        geo.placeCuboid(
+            ED,
+            (bed_x - 1, y - 1, bed_z - 1),
+            (bed_x + 1, y - 1, bed_z + 1),
+            _block("light_gray_carpet")
+        )
     
     # Add kitchen area
     kitchen_x = xaxis - width//3
@@ -897,151 +970,172 @@ def add_interior_details(ED, xaxis, zaxis, y, width, length, height, theme_mater
     
     # Kitchen counter
     for dx in range(3):
-        ED.placeBlock((kitchen_x + dx, y, kitchen_z), Block("spruce_stairs", {"facing": "south"}))
+        place((kitchen_x + dx, y, kitchen_z), STAIRS["south"])
     
     # Add cooking items
-    ED.placeBlock((kitchen_x, y + 1, kitchen_z), Block("smoker", {"facing": "south"}))
-    ED.placeBlock((kitchen_x + 1, y + 1, kitchen_z), Block("crafting_table"))
-    ED.placeBlock((kitchen_x + 2, y + 1, kitchen_z), Block("barrel"))
+    place((kitchen_x, y + 1, kitchen_z), _block("smoker", facing="south"))
+    place((kitchen_x + 1, y + 1, kitchen_z), _block("crafting_table"))
+    place((kitchen_x + 2, y + 1, kitchen_z), _block("barrel"))
     
     # Kitchen storage
     for dx in range(3):
-        ED.placeBlock((kitchen_x + dx, y, kitchen_z - 1), Block("chest", {"facing": "north"}))
+        place((kitchen_x + dx, y, kitchen_z - 1), _block("chest", facing="north"))
     
     # Add a dining area
     table_x = kitchen_x
     table_z = kitchen_z - 3
     
     # Table
-    ED.placeBlock((table_x, y, table_z), Block("spruce_fence"))
-    ED.placeBlock((table_x, y + 1, table_z), Block("spruce_trapdoor", {"facing": "north", "half": "top"}))
+    place((table_x, y, table_z), B_FENCE)
+    place((table_x, y + 1, table_z), _block("spruce_trapdoor", facing="north", half="top"))
     
     # Chairs
-    ED.placeBlock((table_x - 1, y, table_z), Block("spruce_stairs", {"facing": "east"}))
-    ED.placeBlock((table_x + 1, y, table_z), Block("spruce_stairs", {"facing": "west"}))
-    ED.placeBlock((table_x, y, table_z - 1), Block("spruce_stairs", {"facing": "south"}))
-    ED.placeBlock((table_x, y, table_z + 1), Block("spruce_stairs", {"facing": "north"}))
+    place((table_x - 1, y, table_z), STAIRS["east"])
+    place((table_x + 1, y, table_z), STAIRS["west"])
+    place((table_x, y, table_z - 1), STAIRS["south"])
+    place((table_x, y, table_z + 1), STAIRS["north"])
     
     # Add lighting throughout the house
-    for dx in range(-width//2 + 3, width//2 - 2, 4):
-        for dz in range(-length//2 + 3, length//2 - 2, 4):
+    for dx in range(west + 3, hw - 2, 4):
+        for dz in range(north + 3, hl - 2, 4):
             # Skip if too close to fireplace
-            if abs(dx - (width//2 - 1)) < 2 and abs(dz) < 2:
+            if abs(dx - (hw - 1)) < 2 and abs(dz) < 2:
                 continue
                 
-            ED.placeBlock((xaxis + dx, y + height - 2, zaxis + dz), Block("lantern", {"hanging": "true"}))
+            place((xaxis + dx, y + height - 2, zaxis + dz), B_LANTERN_HANG)
     
     # Add some plants and decorations
     plant_positions = [
-        (xaxis - width//2 + 2, zaxis + length//2 - 2),
-        (xaxis + width//2 - 2, zaxis - length//2 + 2),
-        (xaxis, zaxis + length//2 - 2)
+        (xaxis - hw + 2, zaxis + hl - 2),
+        (xaxis + hw - 2, zaxis - hl + 2),
+        (xaxis, zaxis + hl - 2)
     ]
     
-    for px, pz in plant_positions:
-        plant_type = choice(["potted_fern", "potted_blue_orchid", "potted_bamboo", "potted_azalea_bush"])
-        
+    plant_blocks = tuple(
+        _block(name) for name in ("potted_fern", "potted_blue_orchid", "potted_bamboo", "potted_azalea_bush")
+    )
+    
+    plant_picks = random_blocks(plant_blocks, len(plant_positions), rng)
+    for (px, pz), plant in zip(plant_positions, plant_picks):
         # Create a decorative plant stand
-        ED.placeBlock((px, y, pz), Block("spruce_fence"))
-        ED.placeBlock((px, y + 1, pz), Block(plant_type))
+        place((px, y, pz), B_FENCE)
+        place((px, y + 1, pz), plant)
 
-def create_basement(ED, xaxis, zaxis, y, width, length, theme_materials):
-    """Add a basement level"""
+def create_basement(ED, xaxis, zaxis, y, width, length, theme_materials, theme_blocks, rng):
+    """Add a basement level, drawing from rng"""
     print("Creating basement...")
     
-    basement_height = 4
+    # Loop-invariant offsets. (-width)//2 rounds down, so the west/north edges get their own names
+    hw, hl = width//2, length//2
+    west, north = -width//2, -length//2
+    place = ED.placeBlock
+    
+    basement_height = BASEMENT_HEIGHT
     
     # Clear basement space
     geo.placeCuboid(
         ED,
-        (xaxis - width//2 + 2, y - basement_height, zaxis - length//2 + 2),
-        (xaxis + width//2 - 2, y - 2, zaxis + length//2 - 2),
-        Block("air")
+        (xaxis - hw + 2, y - basement_height, zaxis - hl + 2),
+        (xaxis + hw - 2, y - 2, zaxis + hl - 2),
+        B_AIR
     )
     
-    # Add basement walls
-    for dx in range(-width//2 + 1, width//2):
-        for dz in range(-length//2 + 1, length//2):
-            for dy in range(-basement_height, -1):
-                # Skip floor
-                if dy == -basement_height:
-                    continue
-                
-                # Only build the perimeter
-                if dx == -width//2 + 1 or dx == width//2 - 1 or dz == -length//2 + 1 or dz == length//2 - 1:
-                    ED.placeBlock(
-                        (xaxis + dx, y + dy, zaxis + dz),
-                        get_random_block(theme_materials["foundation"])
-                    )
+    # Add basement walls, one cuboid per face; gdpc picks a foundation block per cell
+    wall_x0 = xaxis + west + 1
+    wall_x1 = xaxis + hw - 1
+    wall_z0 = zaxis + north + 1
+    wall_z1 = zaxis + hl - 1
+    wall_y0 = y - basement_height + 1
+    wall_y1 = y - 2
+    # The -z and +z faces run the full width; the x faces stop short of the corners
+    for low, high in (
+        ((wall_x0, wall_y0, wall_z0), (wall_x1, wall_y1, wall_z0)),
+        ((wall_x0, wall_y0, wall_z1), (wall_x1, wall_y1, wall_z1)),
+        ((wall_x0, wall_y0, wall_z0 + 1), (wall_x0, wall_y1, wall_z1 - 1)),
+        ((wall_x1, wall_y0, wall_z0 + 1), (wall_x1, wall_y1, wall_z1 - 1)),
+    ):
+        geo.placeCuboid(ED, low, high, theme_blocks["foundation"])
     
     # Add basement floor
-    for dx in range(-width//2 + 2, width//2 - 1):
-        for dz in range(-length//2 + 2, length//2 - 1):
-            ED.placeBlock(
-                (xaxis + dx, y - basement_height, zaxis + dz),
-                get_random_block(theme_materials["floor"])
-            )
+    geo.placeCuboid(
+        ED,
+        (xaxis + west + 2, y - basement_height, zaxis + north + 2),
+        (xaxis + hw - 2, y - basement_height, zaxis + hl - 2),
+        theme_blocks["floor"]
+    )
     
     # Add stairs to the basement
     stairs_x = xaxis
     stairs_z = zaxis - length//4
     
     for i in range(1, basement_height):
-        ED.placeBlock(
+        place(
             (stairs_x - i, y - i, stairs_z),
-            Block("spruce_stairs", {"facing": "east"})
+            STAIRS["east"]
         )
         
         # Add railings
-        ED.placeBlock((stairs_x - i, y - i + 1, stairs_z + 1), Block("spruce_fence"))
-        ED.placeBlock((stairs_x - i, y - i + 1, stairs_z - 1), Block("spruce_fence"))
+        place((stairs_x - i, y - i + 1, stairs_z + 1), B_FENCE)
+        place((stairs_x - i, y - i + 1, stairs_z - 1), B_FENCE)
     
     # Add storage area in basement
-    for z in range(-length//2 + 3, length//2 - 2, 3):
-        ED.placeBlock((xaxis - width//2 + 2, y - basement_height + 1, zaxis + z), Block("chest", {"facing": "east"}))
-        ED.placeBlock((xaxis + width//2 - 2, y - basement_height + 1, zaxis + z), Block("barrel"))
+    for z in range(north + 3, hl - 2, 3):
+        place((xaxis - hw + 2, y - basement_height + 1, zaxis + z), _block("chest", facing="east"))
+        place((xaxis + hw - 2, y - basement_height + 1, zaxis + z), _block("barrel"))
     
     # Add basement lighting
-    for dx in range(-width//2 + 4, width//2 - 3, 3):
-        for dz in range(-length//2 + 4, length//2 - 3, 3):
-            ED.placeBlock(
+    for dx in range(west + 4, hw - 3, 3):
+        for dz in range(north + 4, hl - 3, 3):
+            place(
                 (xaxis + dx, y - 2, zaxis + dz),
-                Block("lantern", {"hanging": "true"})
+                B_LANTERN_HANG
             )
     
     # Add some themed basement details
     # Wine cellar section
     for dx in range(3):
-        ED.placeBlock(
-            (xaxis + width//2 - 4 - dx, y - basement_height + 1, zaxis + length//2 - 3),
-            Block("barrel", {"facing": "north"})
+        place(
+            (xaxis + hw - 4 - dx, y - basement_height + 1, zaxis + hl - 3),
+            _block("barrel", facing="north")
         )
     
     # Add some cobwebs for atmosphere
-    for _ in range(5):
-        dx = randint(-width//2 + 2, width//2 - 2)
-        dz = randint(-length//2 + 2, length//2 - 2)
-        ED.placeBlock((xaxis + dx, y - 2, zaxis + dz), Block("cobweb"))
+    cobweb = _block("cobweb")
+    cobweb_dx = rng.integers(west + 2, hw - 1, 5)
+    cobweb_dz = rng.integers(north + 2, hl - 1, 5)
+    for dx, dz in zip(cobweb_dx.tolist(), cobweb_dz.tolist()):
+        place((xaxis + dx, y - 2, zaxis + dz), cobweb)
     
     # Add some ores in the walls to suggest a mine
-    ore_types = ["coal_ore", "iron_ore", "gold_ore", "redstone_ore"]
-    for _ in range(8):
-        dx = choice([-width//2 + 1, width//2 - 1])
-        dz = randint(-length//2 + 2, length//2 - 2)
-        dy = randint(-basement_height, -2)
-        ED.placeBlock((xaxis + dx, y + dy, zaxis + dz), Block(choice(ore_types)))
+    ore_blocks = tuple(_block(name) for name in ("coal_ore", "iron_ore", "gold_ore", "redstone_ore"))
+    ore_dx = np.where(rng.integers(0, 2, 8), hw - 1, west + 1)
+    ore_dz = rng.integers(north + 2, hl - 1, 8)
+    ore_dy = rng.integers(-basement_height, -1, 8)
+    ores = random_blocks(ore_blocks, 8, rng)
+    for dx, dz, dy, ore in zip(ore_dx.tolist(), ore_dz.tolist(), ore_dy.tolist(), ores):
+        place((xaxis + dx, y + dy, zaxis + dz), ore)
 
-def build_luxury_mansion(enhance=True):
-    """Build a luxury mansion with advanced features"""
+def build_luxury_mansion(enhance=True, seed=None):
+    """Build a luxury mansion with advanced features.
+    
+    Every draw comes from one generator seeded with seed; the threaded planners and the
+    garden get children spawned from it, so passing the same seed reproduces a build.
+    """
+    rng = np.random.default_rng(seed)
+    
+    # gdpc picks a block for each position from block sequences with the random module
+    random.seed(int(rng.integers(0, 2**63)))
+    
     # Select a design theme
-    theme_name = choice(list(THEMES.keys()))
+    theme_name = str(rng.choice(list(THEMES.keys())))
     theme_materials = THEMES[theme_name]
+    theme_blocks = THEME_BLOCKS[theme_name]
     print(f"Building a {theme_name} style luxury mansion...")
 
     # Determine house dimensions
-    width = randint(13, 19)
-    length = randint(19, 27)
-    height = randint(6, 9)
+    width = int(rng.integers(13, 20))
+    length = int(rng.integers(19, 28))
+    height = int(rng.integers(6, 10))
     
     # Ensure width and length are odd for better symmetry
     if width % 2 == 0: width += 1
@@ -1050,41 +1144,82 @@ def build_luxury_mansion(enhance=True):
     # Find build location
     xaxis = STARTX + (LASTX - STARTX) // 2
     zaxis = STARTZ + (LASTZ - STARTZ) // 2
-    heights = WORLDSLICE.heightmaps["MOTION_BLOCKING_NO_LEAVES"]
+    heights = HEIGHTMAP
     
     # Find average height in building footprint
-    height_sum = 0
-    count = 0
-    for dx in range(-width//2 - 3, width//2 + 4):
-        for dz in range(-length//2 - 3, length//2 + 4):
-            if 0 <= xaxis + dx - STARTX < len(heights) and 0 <= zaxis + dz - STARTZ < len(heights[0]):
-                height_sum += heights[(xaxis + dx - STARTX, zaxis + dz - STARTZ)]
-                count += 1
+    x0 = max(0, xaxis + (-width//2) - 3 - STARTX)
+    x1 = min(heights.shape[0], xaxis + width//2 + 4 - STARTX)
+    z0 = max(0, zaxis + (-length//2) - 3 - STARTZ)
+    z1 = min(heights.shape[1], zaxis + length//2 + 4 - STARTZ)
+    footprint = heights[x0:x1, z0:z1]
     
     # Set y at average height, rounded up
-    y = (height_sum // count) + 1 if count > 0 else 64
+    y = int(footprint.sum()) // footprint.size + 1 if footprint.size else 64
     
     # Create a map of terrain adjustments needed
     adjustments = create_terrain_adjustment_map(heights, xaxis, zaxis, width, length, y, STARTX, STARTZ)
     
-    # Base building functions
-    clear_space(ED, xaxis, zaxis, y, width, length, height, "pitched")
-    build_foundation(ED, xaxis, zaxis, y, width, length, theme_materials, adjustments)
-    build_floor(ED, xaxis, zaxis, y, width, length, theme_materials)
-    build_walls(ED, xaxis, zaxis, y, width, length, height, theme_materials)
-    build_roof(ED, xaxis, zaxis, y, width, length, height, theme_materials)
-    
-    # Add exterior features
-    add_door(ED, xaxis, zaxis, y, width, length, theme_materials)
-    add_windows(ED, xaxis, zaxis, y, width, length, height, theme_materials)
+    # Plan the foundation, floor and windows side by side. The planners never touch the
+    # editor, so only applying their placements has to happen in build order. Generators
+    # are not safe to share between threads, so each planner draws from its own child.
+    foundation_rng, floor_rng, window_rng = rng.spawn(3)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        foundation_plan = pool.submit(plan_foundation, xaxis, zaxis, y, width, length,
+                                      theme_materials, theme_blocks, adjustments, foundation_rng)
+        floor_plan = pool.submit(plan_floor, xaxis, zaxis, y, width, length, theme_materials, theme_blocks,
+                                 floor_rng)
+        window_plan = pool.submit(plan_windows, xaxis, zaxis, y, width, length, height, theme_materials,
+                                  window_rng)
+        
+        # Base building functions
+        clear_space(ED, xaxis, zaxis, y, width, length, height, "pitched")
     
-    # Add interior features
-    add_interior_details(ED, xaxis, zaxis, y, width, length, height, theme_materials)
+    apply_placements(ED, foundation_plan.result())
+    apply_placements(ED, floor_plan.result())
+    build_walls(ED, xaxis, zaxis, y, width, length, height, theme_materials, theme_blocks, rng)
+    build_roof(ED, xaxis, zaxis, y, width, length, height, theme_materials, theme_blocks, rng)
     
-    # Optional enhanced features
-    if enhance:
-        create_basement(ED, xaxis, zaxis, y, width, length, theme_materials)
-        create_garden(ED, xaxis, zaxis, y, width, length, theme_materials, adjustments)
+    # Add exterior features
+    add_door(ED, xaxis, zaxis, y, width, length, theme_materials, theme_blocks)
+    apply_placements(ED, window_plan.result())
+    
+    # The interior and basement stay between the west and east walls (the dining chairs can
+    # reach the north wall). When that box misses every box the garden can place in, the
+    # garden is sent from its own editor while they go out on ED; otherwise it is built last
+    # on ED. The garden path covers the porch and the window boxes sit just outside the
+    # walls, so the door and windows go out before it starts.
+    house_box = (
+        (xaxis + (-width//2) + 1, y - BASEMENT_HEIGHT, zaxis + (-length//2)),
+        (xaxis + width//2 - 1, y + height - 1, zaxis + length//2),
+    )
+    concurrent_garden = enhance and not any(
+        _boxes_overlap(house_box, box) for box in garden_boxes(xaxis, zaxis, y, width, length)
+    )
+    garden_rng = rng.spawn(1)[0]
+    garden_editor = None
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        if concurrent_garden:
+            ED.flushBuffer()
+            ED.awaitBufferFlushes()
+            garden_editor = Editor(buffering=True, bufferLimit=16384)
+            garden = pool.submit(create_garden, garden_editor, xaxis, zaxis, y, width, length,
+                                 theme_materials, adjustments, garden_rng)
+        
+        # Add interior features
+        add_interior_details(ED, xaxis, zaxis, y, width, length, height, theme_materials, theme_blocks, rng)
+        
+        # Optional enhanced features
+        if enhance:
+            create_basement(ED, xaxis, zaxis, y, width, length, theme_materials, theme_blocks, rng)
+            if not concurrent_garden:
+                create_garden(ED, xaxis, zaxis, y, width, length, theme_materials, adjustments, garden_rng)
+    
+    # Send what is left in the buffers and wait for the background sends to finish
+    if garden_editor is not None:
+        garden.result()
+        garden_editor.flushBuffer()
+    ED.flushBuffer()
+    ED.awaitBufferFlushes()
     
     return (xaxis, y, zaxis, width, length, height)
 
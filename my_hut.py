@@ -6,6 +6,15 @@ from gdpc.exceptions import InterfaceConnectionError, BuildAreaNotSetError
 # Create editor
 ED = Editor(buffering=True)
 
+# Blocks used by the hut, built once
+B_STONE_BRICKS = Block("stone_bricks")
+B_SPRUCE_PLANKS = Block("spruce_planks")
+B_OAK_PLANKS = Block("oak_planks")
+B_GLASS_PANE = Block("glass_pane")
+STAIRS = {facing: Block("dark_oak_stairs", {"facing": facing}) for facing in ("east", "west")}
+DOOR_LOWER = Block("spruce_door", {"facing": "east", "half": "lower"})
+DOOR_UPPER = Block("spruce_door", {"facing": "east", "half": "upper"})
+
 # Get build area
 try:
     BUILD_AREA = ED.getBuildArea()
@@ -38,7 +47,7 @@ def buildCozyHut():
         ED,
         (xaxis - width//2 - 1, y - 1, zaxis - length//2 - 1),
         (xaxis + width//2 + 1, y - 1, zaxis + length//2 + 1),
-        Block("stone_bricks")
+        B_STONE_BRICKS
     )
     
     # Build walls
@@ -46,7 +55,7 @@ def buildCozyHut():
         ED,
         (xaxis - width//2, y, zaxis - length//2),
         (xaxis + width//2, y + height - 1, zaxis + length//2),
-        Block("spruce_planks")
+        B_SPRUCE_PLANKS
     )
     
     # Add floor
@@ -54,32 +63,29 @@ def buildCozyHut():
         ED,
         (xaxis - width//2 + 1, y, zaxis - length//2 + 1),
         (xaxis + width//2 - 1, y, zaxis + length//2 - 1),
-        Block("oak_planks")
+        B_OAK_PLANKS
     )
     
     # Build pitched roof
+    west_x = xaxis - width//2
+    east_x = xaxis + width//2
+    zmin = zaxis - length//2 - 1
+    zmax = zaxis + length//2 + 1
+    stair_east = STAIRS["east"]
+    stair_west = STAIRS["west"]
     for i in range(width//2 + 2):
-        geo.placeCuboid(
-            ED,
-            (xaxis - width//2 + i, y + height + i, zaxis - length//2 - 1),
-            (xaxis - width//2 + i, y + height + i, zaxis + length//2 + 1),
-            Block("dark_oak_stairs", {"facing": "east"})
-        )
-        geo.placeCuboid(
-            ED,
-            (xaxis + width//2 - i, y + height + i, zaxis - length//2 - 1),
-            (xaxis + width//2 - i, y + height + i, zaxis + length//2 + 1),
-            Block("dark_oak_stairs", {"facing": "west"})
-        )
+        roof_y = y + height + i
+        geo.placeCuboid(ED, (west_x + i, roof_y, zmin), (west_x + i, roof_y, zmax), stair_east)
+        geo.placeCuboid(ED, (east_x - i, roof_y, zmin), (east_x - i, roof_y, zmax), stair_west)
     
     # Add door
     ED.placeBlock(
         (xaxis - width//2, y, zaxis),
-        Block("spruce_door", {"facing": "east", "half": "lower"})
+        DOOR_LOWER
     )
     ED.placeBlock(
         (xaxis - width//2, y + 1, zaxis),
-        Block("spruce_door", {"facing": "east", "half": "upper"})
+        DOOR_UPPER
     )
     
     # Add windows
@@ -89,7 +95,7 @@ def buildCozyHut():
             ED,
             (wx, y + 1, wz),
             (wx, y + 2, wz),
-            Block("glass_pane")
+            B_GLASS_PANE
         )
 
 def main():
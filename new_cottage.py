@@ -1,16 +1,17 @@
 #!/usr/bin/env python3
 import logging
 import numpy as np
-from random import randint, choice, random
+from random import randint, random
 from termcolor import colored
 from gdpc import Block, Editor
 from gdpc import geometry as geo
+from summed_area import window_sums
 import atexit
 import matplotlib.pyplot as plt
 
 # Set up logging and editor
 logging.basicConfig(format=colored("%(name)s - %(levelname)s - %(message)s", color="yellow"))
-ED = Editor(buffering=True)
+ED = Editor(buffering=True, bufferLimit=4096)
 atexit.register(ED.flushBuffer)
 BUILD_AREA = ED.getBuildArea()
 STARTX, STARTY, STARTZ = BUILD_AREA.begin
@@ -27,31 +28,17 @@ def find_best_location(large_array, sub_array_size):
     if sub_array_size > num_rows or sub_array_size > num_cols:
         raise ValueError("Sub-array size is larger than the original array.")
     
-    # Calculate maximum starting positions
-    max_start_row = num_rows - sub_array_size
-    max_start_col = num_cols - sub_array_size
-    
-    # Initialize variables to track flattest sub-array
-    min_gradient_magnitude = float('inf')
-    best_position = (0, 0)
-    
-    # Iterate over all valid starting positions
-    for start_row in range(max_start_row + 1):
-        for start_col in range(max_start_col + 1):
-            # Extract the current sub-array
-            current_subarray = large_array[start_row:start_row + sub_array_size, 
-                                        start_col:start_col + sub_array_size]
-            
-            # Calculate the gradient magnitude for this sub-array
-            gy, gx = np.gradient(current_subarray)
-            gradient_magnitude = np.sqrt(gx**2 + gy**2)
-            avg_gradient = np.mean(gradient_magnitude)
-            avg_height = np.mean(current_subarray)
-            
-            # If this sub-array is flatter than the flattest one found so far, update
-            if avg_gradient < min_gradient_magnitude:
-                min_gradient_magnitude = avg_gradient
-                best_position = (start_row, start_col)
+    # Gradient magnitude of the whole heightmap, computed once in float32
+    gy, gx = np.gradient(large_array.astype(np.float32, copy=False))
+    gradient_magnitude = np.hypot(gx, gy)
+    
+    # Gradient total of every k x k window, accumulated in float64 so the sums do not drift on
+    # large maps. The lowest sum is also the lowest average, as all windows match in size.
+    k = sub_array_size
+    gradient_sums = window_sums(gradient_magnitude, k, dtype=np.float64)
+    
+    # First flattest window in row-major order, like the original scan
+    best_position = tuple(int(i) for i in np.unravel_index(np.argmin(gradient_sums), gradient_sums.shape))
     
     # Convert heightmap position to world coordinates
     world_x = best_position[1] + STARTX  # col = x
@@ -82,22 +69,21 @@ def clear_space(ED, start_x, start_z, y, width, length, height):
 
 def build_foundation(ED, start_x, start_z, y, width, length, heightmap, STARTX, STARTZ):
     print("Building foundation...")
-    # Foundation support
-    for dx in range(width + 2):
-        for dz in range(length + 2):
-            x_coord = (start_x + dx) - STARTX
-            z_coord = (start_z + dz) - STARTZ
-            
-            # Check if the coordinates are within the slice bounds
-            if 0 <= x_coord < len(heightmap) and 0 <= z_coord < len(heightmap[0]):
-                current_height = heightmap[(z_coord, x_coord)]
-                if current_height < y - 1:
-                    geo.placeCuboid(
-                        ED,
-                        (start_x + dx, current_height, start_z + dz),
-                        (start_x + dx, y - 1, start_z + dz),
-                        Block("cobblestone")
-                    )
+    # Heightmap is indexed [z, x]
+    map_rows, map_cols = heightmap.shape
+    # Foundation support: the footprint's heights, clipped to the slice bounds
+    x_lo, x_hi = np.clip([start_x - STARTX, start_x + width + 2 - STARTX], 0, map_cols).tolist()
+    z_lo, z_hi = np.clip([start_z - STARTZ, start_z + length + 2 - STARTZ], 0, map_rows).tolist()
+    heights = heightmap[z_lo:z_hi, x_lo:x_hi]
+    
+    # Fill every column that dips below the floor from the ground up, as one batch
+    z_idx, x_idx = np.nonzero(heights < y - 1)
+    support = [
+        (STARTX + x_lo + x, support_y, STARTZ + z_lo + z)
+        for z, x, current_height in zip(z_idx.tolist(), x_idx.tolist(), heights[z_idx, x_idx].tolist())
+        for support_y in range(current_height, y)
+    ]
+    ED.placeBlock(support, Block("cobblestone"))
     
     # Base foundation
     geo.placeCuboid(
@@ -109,48 +95,37 @@ def build_foundation(ED, start_x, start_z, y, width, length, heightmap, STARTX,
 
 def build_floor(ED, start_x, start_z, y, width, length):
     print("Adding floor...")
+    # Split the checkerboard into its two colours and send each as one batch
+    dark_cells = []
+    light_cells = []
     for dx in range(width):
         for dz in range(length):
             if (dx + dz) % 2 == 0:
-                ED.placeBlock((start_x + dx, y - 1, start_z + dz), Block("dark_oak_planks"))
+                dark_cells.append((start_x + dx, y - 1, start_z + dz))
             else:
-                ED.placeBlock((start_x + dx, y - 1, start_z + dz), Block("oak_planks"))
+                light_cells.append((start_x + dx, y - 1, start_z + dz))
+    ED.placeBlock(dark_cells, Block("dark_oak_planks"))
+    ED.placeBlock(light_cells, Block("oak_planks"))
 
 def build_walls(ED, start_x, start_z, y, width, length, height):
     """Build walls starting from the top-left corner."""
     print("Building walls...")
     
     # Front and back walls
-    for x in range(start_x, start_x + width + 1):
-        # Front wall
-        geo.placeCuboid(
-            ED,
-            (x, y - 1, start_z),
-            (x, y + height - 1, start_z),
-            Block("stone")
-        )
-        # Back wall
+    for z in [start_z, start_z + length]:
         geo.placeCuboid(
             ED,
-            (x, y - 1, start_z + length),
-            (x, y + height - 1, start_z + length),
+            (start_x, y - 1, z),
+            (start_x + width, y + height - 1, z),
             Block("stone")
         )
     
     # Side walls
-    for z in range(start_z, start_z + length + 1):
-        # Left wall
-        geo.placeCuboid(
-            ED,
-            (start_x, y - 1, z),
-            (start_x, y + height - 1, z),
-            Block("stone")
-        )
-        # Right wall
+    for x in [start_x, start_x + width]:
         geo.placeCuboid(
             ED,
-            (start_x + width, y - 1, z),
-            (start_x + width, y + height - 1, z),
+            (x, y - 1, start_z),
+            (x, y + height - 1, start_z + length),
             Block("stone")
         )
     
@@ -166,48 +141,30 @@ def build_walls(ED, start_x, start_z, y, width, length, height):
 
 def build_roof(ED, start_x, start_z, y, width, length, height):
     print("Building roof...")
-    # Triangular gables
+    # Triangular gables, front and back, one layer per row
+    gables = []
     for i in range(width//2 + 1):
-        # Front gable
-        geo.placeCuboid(
-            ED,
-            (start_x + i, y + height - 1 + i, start_z),
-            (start_x + width - i, y + height - 1 + i, start_z),
-            Block("spruce_planks")
-        )
-        # Back gable
-        geo.placeCuboid(
-            ED,
-            (start_x + i, y + height - 1 + i, start_z + length),
-            (start_x + width - i, y + height - 1 + i, start_z + length),
-            Block("spruce_planks")
-        )
+        for z in [start_z, start_z + length]:
+            gables.extend((x, y + height - 1 + i, z) for x in range(start_x + i, start_x + width - i + 1))
+    ED.placeBlock(gables, Block("spruce_planks"))
     
-    # Roof slopes
-    for i in range(width//2 + 2):
-        if i == width//2 + 1:
-            # Ridge beam
-            geo.placeCuboid(
-                ED,
-                (start_x + width//2, y + height + i - 1, start_z - 1),
-                (start_x + width//2, y + height + i - 1, start_z + length + 1),
-                Block("dark_oak_planks")
-            )
-        else:
-            # Left slope
-            geo.placeCuboid(
-                ED,
-                (start_x + i, y + height + i, start_z - 1),
-                (start_x + i, y + height + i, start_z + length + 1),
-                Block("dark_oak_stairs", {"facing": "east"})
-            )
-            # Right slope
-            geo.placeCuboid(
-                ED,
-                (start_x + width - i, y + height + i, start_z - 1),
-                (start_x + width - i, y + height + i, start_z + length + 1),
-                Block("dark_oak_stairs", {"facing": "west"})
-            )
+    # Roof slopes, left then right so the right side wins where they meet
+    left_slope = []
+    right_slope = []
+    for i in range(width//2 + 1):
+        for z in range(start_z - 1, start_z + length + 2):
+            left_slope.append((start_x + i, y + height + i, z))
+            right_slope.append((start_x + width - i, y + height + i, z))
+    ED.placeBlock(left_slope, Block("dark_oak_stairs", {"facing": "east"}))
+    ED.placeBlock(right_slope, Block("dark_oak_stairs", {"facing": "west"}))
+    
+    # Ridge beam
+    geo.placeCuboid(
+        ED,
+        (start_x + width//2, y + height + width//2, start_z - 1),
+        (start_x + width//2, y + height + width//2, start_z + length + 1),
+        Block("dark_oak_planks")
+    )
 
 def add_details(ED, start_x, start_z, y, width, length, height):
     print("Adding details...")
@@ -217,33 +174,34 @@ def add_details(ED, start_x, start_z, y, width, length, height):
     ED.placeBlock((door_x, y, door_z), Block("spruce_door", {"facing": "west", "half": "lower"}))
     ED.placeBlock((door_x, y + 1, door_z), Block("spruce_door", {"facing": "west", "half": "upper"}))
     
-    # Windows
-    window_positions = []
-    
-    # Side windows
-    for z_offset in range(2, length - 1, 3):
-        window_positions.append((start_x, start_z + z_offset))  # Left wall
-        window_positions.append((start_x + width, start_z + z_offset))  # Right wall
-    
-    # Front and back windows
-    for x_offset in range(2, width - 1, 3):
-        window_positions.append((start_x + x_offset, start_z))  # Front wall
-        window_positions.append((start_x + x_offset, start_z + length))  # Back wall
-    
-    for wx, wz in window_positions:
-        # Skip if it's the door position
-        if not (wx == door_x and wz == door_z):
-            ED.placeBlock((wx, y + 1, wz), Block("glass_pane"))
-            ED.placeBlock((wx, y + 2, wz), Block("glass_pane"))
-            
-            # Determine facing direction for trapdoors
-            facing = "north"
-            if wz == start_z: facing = "south"  # Front wall
-            elif wz == start_z + length: facing = "north"  # Back wall
-            elif wx == start_x: facing = "east"  # Left wall
-            elif wx == start_x + width: facing = "west"  # Right wall
-            
-            ED.placeBlock((wx, y, wz), Block("spruce_trapdoor", {"facing": facing, "half": "top"}))
+    # Windows every third block along each wall, as one (N, 2) array of (x, z)
+    z_offsets = np.arange(2, length - 1, 3)
+    x_offsets = np.arange(2, width - 1, 3)
+    window_positions = np.concatenate([
+        np.column_stack([np.full(len(z_offsets), start_x), start_z + z_offsets]),  # Left wall
+        np.column_stack([np.full(len(z_offsets), start_x + width), start_z + z_offsets]),  # Right wall
+        np.column_stack([start_x + x_offsets, np.full(len(x_offsets), start_z)]),  # Front wall
+        np.column_stack([start_x + x_offsets, np.full(len(x_offsets), start_z + length)]),  # Back wall
+    ])
+    
+    # Trapdoors face out of their wall, known from the wall each window was built on
+    window_facings = np.array(["east"] * len(z_offsets) + ["west"] * len(z_offsets)
+                              + ["south"] * len(x_offsets) + ["north"] * len(x_offsets))
+    
+    # Skip the door position
+    not_door = ~((window_positions[:, 0] == door_x) & (window_positions[:, 1] == door_z))
+    window_positions, window_facings = window_positions[not_door], window_facings[not_door]
+    
+    # Pane and trapdoor blocks, one per facing
+    pane_block = Block("glass_pane")
+    trapdoors = {facing: Block("spruce_trapdoor", {"facing": facing, "half": "top"})
+                 for facing in ("north", "south", "east", "west")}
+    
+    for (wx, wz), facing in zip(window_positions.tolist(), window_facings.tolist()):
+        ED.placeBlock((wx, y + 1, wz), pane_block)
+        ED.placeBlock((wx, y + 2, wz), pane_block)
+        
+        ED.placeBlock((wx, y, wz), trapdoors[facing])
     
     # Chimney
     chimney_x = start_x + width - 2
@@ -308,13 +266,14 @@ def add_interior(ED, start_x, start_z, y, width, length, height):
     ED.placeBlock((table_x + 1, y, table_z), Block("oak_stairs", {"facing": "west"}))  # Chair
     
     # Lighting
-    for x_off in [width//4, width*3//4]:
-        for z_off in [length//4, length*3//4]:
-            ED.placeBlock((start_x + x_off, y + height - 2, start_z + z_off), 
-                         Block("lantern", {"hanging": "true"}))
+    ED.placeBlock([(start_x + x_off, y + height - 2, start_z + z_off)
+                   for x_off in [width//4, width*3//4] for z_off in [length//4, length*3//4]],
+                  Block("lantern", {"hanging": "true"}))
 
 def add_fence(ED, start_x, start_z, y, width, length, heightmap, STARTX, STARTZ):
     print("Adding garden fence...")
+    # Heightmap is indexed [z, x]
+    map_rows, map_cols = heightmap.shape
     
     # Define fence margins (distance from house to fence)
     margin = 4
@@ -329,82 +288,36 @@ def add_fence(ED, start_x, start_z, y, width, length, heightmap, STARTX, STARTZ)
     fence_block = "spruce_fence"
     gate_block = "spruce_fence_gate"
     
-    # Build front fence (including corners)
-    for x in range(fence_start_x, fence_end_x + 1):
-        # Get the height at this position from the heightmap
-        x_coord = x - STARTX
-        z_coord = fence_start_z - STARTZ
-        if 0 <= x_coord < len(heightmap[0]) and 0 <= z_coord < len(heightmap):
-            fence_y = heightmap[(z_coord, x_coord)]
-            
-            # Ensure there's solid ground below the fence
-            for y_check in range(fence_y - 3, fence_y):
-                block = ED.getBlock((x, y_check, fence_start_z))
-                if block is None or block.id == "air":
-                    ED.placeBlock((x, y_check, fence_start_z), Block("dirt"))
-            
-            ED.placeBlock((x, fence_y, fence_start_z), Block(fence_block))
-            
-            # Add lantern on corners
-            if x == fence_start_x or x == fence_end_x:
-                ED.placeBlock((x, fence_y + 1, fence_start_z), Block("lantern"))
-    
-    # Build back fence (including corners)
-    for x in range(fence_start_x, fence_end_x + 1):
-        x_coord = x - STARTX
-        z_coord = fence_end_z - STARTZ
-        if 0 <= x_coord < len(heightmap[0]) and 0 <= z_coord < len(heightmap):
-            fence_y = heightmap[(z_coord, x_coord)]
-            
-            # Ensure there's solid ground below the fence
-            for y_check in range(fence_y - 3, fence_y):
-                block = ED.getBlock((x, y_check, fence_end_z))
-                if block is None or block.id == "air":
-                    ED.placeBlock((x, y_check, fence_end_z), Block("dirt"))
-            
-            ED.placeBlock((x, fence_y, fence_end_z), Block(fence_block))
-            
-            # Add lantern on corners
-            if x == fence_start_x or x == fence_end_x:
-                ED.placeBlock((x, fence_y + 1, fence_end_z), Block("lantern"))
-    
-    # Build left fence (excluding corners)
-    for z in range(fence_start_z + 1, fence_end_z):
-        x_coord = fence_start_x - STARTX
-        z_coord = z - STARTZ
-        if 0 <= x_coord < len(heightmap[0]) and 0 <= z_coord < len(heightmap):
-            fence_y = heightmap[(z_coord, x_coord)]
-            
-            # Ensure there's solid ground below the fence
-            for y_check in range(fence_y - 3, fence_y):
-                block = ED.getBlock((fence_start_x, y_check, z))
-                if block is None or block.id == "air":
-                    ED.placeBlock((fence_start_x, y_check, z), Block("dirt"))
-            
-            ED.placeBlock((fence_start_x, fence_y, z), Block(fence_block))
-    
-    # Build right fence (excluding corners)
-    for z in range(fence_start_z + 1, fence_end_z):
-        x_coord = fence_end_x - STARTX
-        z_coord = z - STARTZ
-        if 0 <= x_coord < len(heightmap[0]) and 0 <= z_coord < len(heightmap):
-            fence_y = heightmap[(z_coord, x_coord)]
-            
-            # Ensure there's solid ground below the fence
-            for y_check in range(fence_y - 3, fence_y):
-                block = ED.getBlock((fence_end_x, y_check, z))
-                if block is None or block.id == "air":
-                    ED.placeBlock((fence_end_x, y_check, z), Block("dirt"))
-            
-            ED.placeBlock((fence_end_x, fence_y, z), Block(fence_block))
+    # Fence line: the front and back edges include the corners, the sides do not
+    edge_xs = np.arange(fence_start_x, fence_end_x + 1)
+    side_zs = np.arange(fence_start_z + 1, fence_end_z)
+    fence_xs = np.concatenate([edge_xs, edge_xs,
+                               np.full(len(side_zs), fence_start_x), np.full(len(side_zs), fence_end_x)])
+    fence_zs = np.concatenate([np.full(len(edge_xs), fence_start_z), np.full(len(edge_xs), fence_end_z),
+                               side_zs, side_zs])
+    
+    # Keep the posts that fall on the heightmap and read all their heights at once
+    x_coords = fence_xs - STARTX
+    z_coords = fence_zs - STARTZ
+    on_map = (x_coords >= 0) & (x_coords < map_cols) & (z_coords >= 0) & (z_coords < map_rows)
+    fence_xs, fence_zs = fence_xs[on_map], fence_zs[on_map]
+    fence_ys = heightmap[z_coords[on_map], x_coords[on_map]]
+    
+    ED.placeBlock(list(zip(fence_xs.tolist(), fence_ys.tolist(), fence_zs.tolist())), Block(fence_block))
+    
+    # Add lanterns on the corners
+    corners = (((fence_xs == fence_start_x) | (fence_xs == fence_end_x))
+               & ((fence_zs == fence_start_z) | (fence_zs == fence_end_z)))
+    ED.placeBlock(list(zip(fence_xs[corners].tolist(), (fence_ys[corners] + 1).tolist(), fence_zs[corners].tolist())),
+                  Block("lantern"))
     
     # Add front gate (centered)
     gate_x = start_x + width//2
     gate_z = fence_start_z
     x_coord = gate_x - STARTX
     z_coord = gate_z - STARTZ
-    if 0 <= x_coord < len(heightmap[0]) and 0 <= z_coord < len(heightmap):
-        gate_y = heightmap[(z_coord, x_coord)]
+    if 0 <= z_coord < map_rows and 0 <= x_coord < map_cols:
+        gate_y = heightmap[z_coord, x_coord]
         ED.placeBlock((gate_x, gate_y, gate_z), Block(gate_block, {"facing": "south"}))
     
     # Add back gate (centered)
@@ -412,41 +325,42 @@ def add_fence(ED, start_x, start_z, y, width, length, heightmap, STARTX, STARTZ)
     gate_z = fence_end_z
     x_coord = gate_x - STARTX
     z_coord = gate_z - STARTZ
-    if 0 <= x_coord < len(heightmap[0]) and 0 <= z_coord < len(heightmap):
-        gate_y = heightmap[(z_coord, x_coord)]
+    if 0 <= z_coord < map_rows and 0 <= x_coord < map_cols:
+        gate_y = heightmap[z_coord, x_coord]
         ED.placeBlock((gate_x, gate_y, gate_z), Block(gate_block, {"facing": "north"}))
     
     return fence_start_z  # Return the z-coordinate of the front fence for path building
 
 def add_path(ED, start_x, start_z, y, width, fence_z, heightmap, STARTX, STARTZ):
     print("Adding entrance path...")
+    # Heightmap is indexed [z, x]
+    map_rows, map_cols = heightmap.shape
     path_x = start_x + width//2
     
     for z in range(fence_z, start_z):
         x_coord = path_x - STARTX
         z_coord = z - STARTZ
-        if 0 <= x_coord < len(heightmap[0]) and 0 <= z_coord < len(heightmap):
-            path_y = heightmap[(z_coord, x_coord)]
+        if 0 <= z_coord < map_rows and 0 <= x_coord < map_cols:
+            path_y = heightmap[z_coord, x_coord]
             ED.placeBlock((path_x, path_y, z), Block("cobblestone"))
             ED.placeBlock((path_x-1, path_y, z), Block("cobblestone"))
 
 def place_tree(ED, x, y, z, tree_type):
     # Base trunk
     height = randint(4, 6)
-    for dy in range(height):
-        ED.placeBlock((x, y + dy, z), Block(f"{tree_type}_log"))
-    
-    # Simple leaf blob
-    for dx in range(-2, 3):
-        for dy in range(height-2, height+2):
-            for dz in range(-2, 3):
-                if abs(dx) + abs(dy-height) + abs(dz) <= 4:
-                    block_x, block_y, block_z = x + dx, y + dy, z + dz
-                    if not (dx == 0 and dz == 0 and dy < height):  # Don't replace trunk
-                        ED.placeBlock((block_x, block_y, block_z), Block(f"{tree_type}_leaves"))
+    geo.placeCuboid(ED, (x, y, z), (x, y + height - 1, z), Block(f"{tree_type}_log"))
+    
+    # Simple leaf blob: every offset within Manhattan distance 4 of the trunk top,
+    # except the trunk column itself
+    dx, dy, dz = np.meshgrid(np.arange(-2, 3), np.arange(height - 2, height + 2), np.arange(-2, 3), indexing="ij")
+    mask = (np.abs(dx) + np.abs(dy - height) + np.abs(dz) <= 4) & ~((dx == 0) & (dz == 0) & (dy < height))
+    leaf_positions = np.stack([x + dx[mask], y + dy[mask], z + dz[mask]], axis=1).tolist()
+    ED.placeBlock(leaf_positions, Block(f"{tree_type}_leaves"))
 
 def add_landscaping(ED, start_x, start_z, y, width, length, heightmap, STARTX, STARTZ):
     print("Adding trees and flowers...")
+    # Heightmap is indexed [z, x]
+    map_rows, map_cols = heightmap.shape
     
     # Define garden area (larger than house footprint but smaller than fence)
     garden_width = width + 6  # Leave 1 block gap from fence
@@ -458,57 +372,66 @@ def add_landscaping(ED, start_x, start_z, y, width, length, heightmap, STARTX, S
         "red_tulip", "orange_tulip", "white_tulip", "pink_tulip", "oxeye_daisy"
     ]
     
-    # Add random flowers around the garden area
-    for _ in range(40):
-        dx = randint(-3, garden_width + 3)
-        dz = randint(-3, garden_length + 3)
-        
-        # Skip if inside or too close to house
-        if (0 <= dx <= width) and (0 <= dz <= length):
-            continue
-            
-        x = start_x + dx
-        z = start_z + dz
-        x_coord, z_coord = x - STARTX, z - STARTZ
-        
-        if 0 <= x_coord < len(heightmap) and 0 <= z_coord < len(heightmap[0]):
-            flower_y = heightmap[(z_coord, x_coord)]
-            flower = choice(flowers)
-            
-            # Don't place flowers too close to trees
-            too_close_to_tree = False
-            for tx, tz in tree_positions:
-                if (dx - tx)**2 + (dz - tz)**2 < 4:
-                    too_close_to_tree = True
-                    break
-            
-            if not too_close_to_tree:
-                ED.placeBlock((x, flower_y, z), Block(flower))
+    # Collect every placement first (a later one replaces an earlier one at the same spot),
+    # then send each block type as a single batch
+    placements = {}
+    
+    # One generator for every random draw below
+    rng = np.random.default_rng()
+    
+    # No trees are planted around the cottage yet; flowers keep clear of any listed here
+    tree_positions = []
+    tree_offsets = np.array(tree_positions, dtype=int).reshape(-1, 2)
+    
+    # Add random flowers around the garden area, drawing every candidate at once
+    dx = rng.integers(-3, garden_width + 4, 40)
+    dz = rng.integers(-3, garden_length + 4, 40)
+    flower_picks = rng.integers(0, len(flowers), 40)
+    x_coord = start_x + dx - STARTX
+    z_coord = start_z + dz - STARTZ
+    
+    # Skip spots inside or too close to the house, off the map, or too close to a tree
+    inside_house = (0 <= dx) & (dx <= width) & (0 <= dz) & (dz <= length)
+    on_map = (0 <= z_coord) & (z_coord < map_rows) & (0 <= x_coord) & (x_coord < map_cols)
+    near_tree = ((dx[:, None] - tree_offsets[:, 0])**2 + (dz[:, None] - tree_offsets[:, 1])**2 < 4).any(axis=1)
+    keep = ~inside_house & on_map & ~near_tree
+    
+    flower_ys = heightmap[z_coord[keep], x_coord[keep]]
+    for x, flower_y, z, pick in zip((x_coord[keep] + STARTX).tolist(), flower_ys.tolist(),
+                                    (z_coord[keep] + STARTZ).tolist(), flower_picks[keep].tolist()):
+        placements[(x, flower_y, z)] = (flowers[pick],)
     
     # Add some tall grass for natural look
-    for _ in range(60):
-        dx = randint(-3, garden_width + 3)
-        dz = randint(-3, garden_length + 3)
-        
-        # Skip if inside house
-        if (0 <= dx <= width) and (0 <= dz <= length):
-            continue
-            
-        x = start_x + dx
-        z = start_z + dz
-        x_coord, z_coord = x - STARTX, z - STARTZ
-        
-        if 0 <= x_coord < len(heightmap) and 0 <= z_coord < len(heightmap[0]):
-            grass_y = heightmap[(z_coord, x_coord)]
-            if random() < 0.7:
-                ED.placeBlock((x, grass_y, z), Block("grass"))
-            else:
-                ED.placeBlock((x, grass_y, z), Block("tall_grass", {"half": "lower"}))
-                ED.placeBlock((x, grass_y + 1, z), Block("tall_grass", {"half": "upper"}))
+    dx = rng.integers(-3, garden_width + 4, 60)
+    dz = rng.integers(-3, garden_length + 4, 60)
+    short_grass = rng.random(60) < 0.7
+    x_coord = start_x + dx - STARTX
+    z_coord = start_z + dz - STARTZ
+    
+    # Skip spots inside the house or off the map
+    inside_house = (0 <= dx) & (dx <= width) & (0 <= dz) & (dz <= length)
+    on_map = (0 <= z_coord) & (z_coord < map_rows) & (0 <= x_coord) & (x_coord < map_cols)
+    keep = ~inside_house & on_map
+    
+    grass_ys = heightmap[z_coord[keep], x_coord[keep]]
+    for x, grass_y, z, short in zip((x_coord[keep] + STARTX).tolist(), grass_ys.tolist(),
+                                    (z_coord[keep] + STARTZ).tolist(), short_grass[keep].tolist()):
+        if short:
+            placements[(x, grass_y, z)] = ("grass",)
+        else:
+            placements[(x, grass_y, z)] = ("tall_grass", "lower")
+            placements[(x, grass_y + 1, z)] = ("tall_grass", "upper")
+    
+    batches = {}
+    for position, key in placements.items():
+        batches.setdefault(key, []).append(position)
+    for key, positions in batches.items():
+        block = Block(key[0], {"half": key[1]}) if len(key) > 1 else Block(key[0])
+        ED.placeBlock(positions, block)
 
 def buildCozyCottage():
-    # Get height map for terrain analysis
-    heightmap = WORLDSLICE.heightmaps["MOTION_BLOCKING_NO_LEAVES"]
+    # Get height map for terrain analysis, as one C-contiguous int32 array
+    heightmap = np.ascontiguousarray(WORLDSLICE.heightmaps["MOTION_BLOCKING_NO_LEAVES"], dtype=np.int32)
     
     # Find the best location for a 10x10 area
     area_size = 10
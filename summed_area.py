@@ -0,0 +1,11 @@
+"""Summed-area table helpers shared by the flat-area searches."""
+import numpy as np
+
+
+def window_sums(array, k, dtype=None):
+    """Sum of every k x k window of array, from a summed-area table with a leading row and column of zeros.
+    
+    dtype sets the accumulator of the table, e.g. float64 to sum float32 values without drift.
+    """
+    sat = np.pad(array, ((1, 0), (1, 0))).cumsum(axis=0, dtype=dtype).cumsum(axis=1)
+    return sat[k:, k:] - sat[:-k, k:] - sat[k:, :-k] + sat[:-k, :-k]
@@ -1,7 +1,17 @@
 #!/usr/bin/env python3
+import functools
 import logging
+import math
+from itertools import groupby
 import numpy as np
 import random
+try:
+    from numba import njit, prange
+except ImportError:
+    # Without numba the kernels below run as plain Python: same results, only slower
+    def njit(*args, **kwargs):
+        return lambda func: func
+    prange = range
 from termcolor import colored
 from gdpc import Block, Editor
 from gdpc import geometry as geo
@@ -10,40 +20,133 @@ import matplotlib.pyplot as plt
 
 # Set up logging and editor
 logging.basicConfig(format=colored("%(name)s - %(levelname)s - %(message)s", color="yellow"))
-ED = Editor(buffering=True)
+ED = Editor(buffering=True, bufferLimit=4096)
 atexit.register(ED.flushBuffer)
 BUILD_AREA = ED.getBuildArea()
 STARTX, STARTY, STARTZ = BUILD_AREA.begin
 LASTX, LASTY, LASTZ = BUILD_AREA.last
 WORLDSLICE = ED.loadWorldSlice(BUILD_AREA.toRect(), cache=True)
 
-def smooth_heightmap(heightmap, window_size=3, threshold=2):
-    # Create a copy of the original heightmap
-    smoothed = heightmap.copy()
+# Heightmaps read once: the top non-air solid blocks (C-contiguous int32, as the search kernel takes it),
+# and the water depth and leaf thickness above them
+HEIGHTMAP = np.ascontiguousarray(WORLDSLICE.heightmaps["MOTION_BLOCKING_NO_LEAVES"], dtype=np.int32)
+WATER = np.ascontiguousarray(WORLDSLICE.heightmaps["MOTION_BLOCKING"] - WORLDSLICE.heightmaps["OCEAN_FLOOR"],
+                             dtype=np.int32)
+LEAVES = WORLDSLICE.heightmaps["MOTION_BLOCKING"] - HEIGHTMAP
+
+@functools.lru_cache(maxsize=512)
+def _block(name, **states):
+    """Return a shared Block for the given id and states, creating it only once"""
+    return Block(name, states)
+
+# Fixed blocks placed inside loops, built once
+B_AIR = _block("air")
+B_LANTERN_HANG = _block("lantern", hanging="true")
+
+@njit(parallel=True, cache=True)
+def _smooth_outliers(padded, heightmap, smoothed, window_size, threshold):
+    """Write the local median into smoothed wherever heightmap is an outlier in its padded window.
+    
+    Each row of cells runs on its own thread and reuses one window buffer.
+    """
     rows, cols = heightmap.shape
-    pad = window_size // 2
-
-    # Pad the array to handle edges
-    padded = np.pad(heightmap, pad, mode='edge')
-
-    # Iterate through each cell in the original heightmap
-    for i in range(rows):
+    for i in prange(rows):
+        window = np.empty(window_size * window_size)
         for j in range(cols):
             # Extract the local window
-            window = padded[i:i + window_size, j:j + window_size]
+            for a in range(window_size):
+                for b in range(window_size):
+                    window[a * window_size + b] = padded[i + a, j + b]
             
             # Calculate local statistics
             local_median = np.median(window)
             local_std = np.std(window)
             
-            # Check if the center value is an outlier
-            center_value = heightmap[i, j]
-            if abs(center_value - local_median) > threshold * local_std:
-                # Replace with local median if it's an outlier
+            # Replace with local median if the center value is an outlier
+            if abs(heightmap[i, j] - local_median) > threshold * local_std:
                 smoothed[i, j] = local_median
 
+def smooth_heightmap(heightmap, window_size=3, threshold=2):
+    # Create a copy of the original heightmap
+    smoothed = heightmap.copy()
+    pad = window_size // 2
+
+    # Pad the array to handle edges
+    padded = np.pad(heightmap, pad, mode='edge')
+
+    # Check every cell against its window in the compiled kernel
+    _smooth_outliers(padded, heightmap, smoothed, window_size, threshold)
+
     return smoothed
 
+# Fast-math without the no-inf/no-NaN flags: the kernel relies on np.inf as its "no dry window" sentinel
+@njit(parallel=True, fastmath={"contract", "arcp", "reassoc", "nsz"}, cache=True)
+def _flattest_window(large_array, water_array, k, first, last_row, last_col):
+    """Lowest gradient magnitude sum over the dry k x k windows starting in [first, last].
+    
+    Each row of start positions is searched on its own thread and keeps its own best;
+    the rows are then reduced serially, so ties go to the first window in row-major order.
+    Returns (sum, row, col), with an infinite sum when every window holds water.
+    """
+    rows = last_row - first + 1
+    cols = last_col - first + 1
+    if rows <= 0 or cols <= 0:
+        return np.inf, first, first
+    row_best = np.full(rows, np.inf)
+    row_best_col = np.zeros(rows, dtype=np.int64)
+    
+    for r in prange(rows):
+        start_row = first + r
+        best = np.inf
+        best_col = 0
+        for c in range(cols):
+            start_col = first + c
+            
+            # Reject the window at its first wet cell
+            wet = False
+            for i in range(k):
+                for j in range(k):
+                    if water_array[start_row + i, start_col + j] != 0:
+                        wet = True
+                        break
+                if wet:
+                    break
+            if wet:
+                continue
+            
+            # Same differences as np.gradient on the window: central inside, one-sided on its edges
+            total = 0.0
+            for i in range(k):
+                row = start_row + i
+                for j in range(k):
+                    col = start_col + j
+                    if i == 0:
+                        gy = float(large_array[row + 1, col] - large_array[row, col])
+                    elif i == k - 1:
+                        gy = float(large_array[row, col] - large_array[row - 1, col])
+                    else:
+                        gy = (large_array[row + 1, col] - large_array[row - 1, col]) * 0.5
+                    if j == 0:
+                        gx = float(large_array[row, col + 1] - large_array[row, col])
+                    elif j == k - 1:
+                        gx = float(large_array[row, col] - large_array[row, col - 1])
+                    else:
+                        gx = (large_array[row, col + 1] - large_array[row, col - 1]) * 0.5
+                    total += math.sqrt(gx * gx + gy * gy)
+            if total < best:
+                best = total
+                best_col = c
+        row_best[r] = best
+        row_best_col[r] = best_col
+    
+    best_sum = np.inf
+    best_row = 0
+    for r in range(rows):
+        if row_best[r] < best_sum:
+            best_sum = row_best[r]
+            best_row = r
+    return best_sum, first + best_row, first + row_best_col[best_row]
+
 def find_flattest_subarray(large_array, sub_array_size):
     # Get array dimensions
     num_rows, num_cols = large_array.shape
@@ -66,37 +169,19 @@ def find_flattest_subarray(large_array, sub_array_size):
     # Initialize variables to track flattest sub-array
     flattest_subarray = None
     flattest_position = None
-    min_gradient_magnitude = float('inf')  # Start with infinity
-
-    water_array = WORLDSLICE.heightmaps['MOTION_BLOCKING'] - WORLDSLICE.heightmaps['OCEAN_FLOOR']
-    leaves_array = WORLDSLICE.heightmaps['MOTION_BLOCKING'] - WORLDSLICE.heightmaps['MOTION_BLOCKING_NO_LEAVES']
-    
-    # Iterate over all valid starting positions, respecting the border margin
-    for start_row in range(border_margin, max_start_row + 1):
-        for start_col in range(border_margin, max_start_col + 1):
-            # Extract the current sub-array
-            current_subarray = large_array[start_row:start_row + sub_array_size, 
-                                          start_col:start_col + sub_array_size]
-            current_water_subarray = water_array[start_row:start_row + sub_array_size, 
-                                               start_col:start_col + sub_array_size]
-            
-            # Calculate the gradient magnitude for this sub-array
-            gy, gx = np.gradient(current_subarray)
-            gradient_magnitude = np.sqrt(gx**2 + gy**2)
-            avg_gradient = np.mean(gradient_magnitude)
-
-            # If this sub-array is flatter than the flattest one found so far and there is no water, update
-            if avg_gradient < min_gradient_magnitude and np.all(current_water_subarray == 0):
-                min_gradient_magnitude = avg_gradient
-                flattest_position = (start_row, start_col)
-                flattest_subarray = current_subarray.copy()  # Make a copy to avoid
-
-            # If this sub-array is flatter than the flattest one found so far and there is no water, update
-            if avg_gradient < min_gradient_magnitude and np.all(current_water_subarray == 0):
-
-                min_gradient_magnitude = avg_gradient
-                flattest_position = (start_row, start_col)
-                flattest_subarray = current_subarray.copy()  # Make a copy to avoid reference issues
+    
+    # Score all valid starting positions, respecting the border margin. All windows share a size,
+    # so the lowest gradient sum is also the lowest average.
+    best_sum, best_row, best_col = _flattest_window(
+        np.ascontiguousarray(large_array, dtype=np.int32),
+        WATER,
+        sub_array_size, border_margin, max_start_row, max_start_col
+    )
+    
+    if np.isfinite(best_sum):
+        flattest_position = (int(best_row), int(best_col))
+        flattest_subarray = large_array[best_row:best_row + sub_array_size,
+                                        best_col:best_col + sub_array_size].copy()
     
     if flattest_position is None:
         print('There is not flat enough surface that is not on water')
@@ -104,32 +189,31 @@ def find_flattest_subarray(large_array, sub_array_size):
 
     # Check for leaves in the optimal area
     start_row, start_col = flattest_position
-    optimal_area_leaves = leaves_array[start_row:start_row + sub_array_size, 
+    optimal_area_leaves = LEAVES[start_row:start_row + sub_array_size, 
                                      start_col:start_col + sub_array_size]
     trees_present = np.any(optimal_area_leaves > 0)
 
     if trees_present:
         # Usage in your code:
-        heightmap = WORLDSLICE.heightmaps["MOTION_BLOCKING_NO_LEAVES"]
-        smoothed_heightmap = smooth_heightmap(heightmap, window_size=7, threshold=2)
+        smoothed_heightmap = smooth_heightmap(HEIGHTMAP, window_size=7, threshold=2)
 
         print("Clearing trees in and around the optimal area...")
         
         # Get array dimensions
         rows, cols = smoothed_heightmap.shape
         
-        # Clear everything above the foundation height in the expanded area
+        # Clear everything above the foundation height in the expanded area, from the local
+        # smoothed height up to a reasonable height, one cuboid per run of equal heights along z
+        z_start = max(0, start_col - margin)
+        z_end = min(cols, start_col + sub_array_size + margin)
         for dx in range(max(0, start_row - margin), min(rows, start_row + sub_array_size + margin)):
-            for dz in range(max(0, start_col - margin), min(cols, start_col + sub_array_size + margin)):
-                world_x = STARTX + dx
-                world_z = STARTZ + dz
-                
-                # Get the height from smoothed_heightmap at this position
-                local_height = smoothed_heightmap[dx, dz]
-                
-                # Clear from local smoothed height up to a reasonable height
-                for y in range(int(local_height), int(local_height) + 20):
-                    ED.placeBlock((world_x, y, world_z), Block("air"))
+            world_x = STARTX + dx
+            world_z = STARTZ + z_start
+            for local_height, run in groupby(smoothed_heightmap[dx, z_start:z_end].tolist()):
+                run_end_z = world_z + len(list(run)) - 1
+                geo.placeCuboid(ED, (world_x, int(local_height), world_z), (world_x, int(local_height) + 19, run_end_z),
+                                B_AIR)
+                world_z = run_end_z + 1
 
     return flattest_position, smoothed_heightmap, flattest_subarray
 
@@ -194,10 +278,12 @@ def create_material_palettes():
         }
     ]
 
+# The palettes, built once at import
+PALETTES = create_material_palettes()
+
 def place_block(position, process_area, smoothed_heightmap):
     # Select a random material palette
-    palettes = create_material_palettes()
-    palette = random.choice(palettes)
+    palette = random.choice(PALETTES)
     
     optimal_x = position[0] # x is the column
     optimal_z = position[1] # y is the row
@@ -205,44 +291,30 @@ def place_block(position, process_area, smoothed_heightmap):
     if smoothed_heightmap is not None:
         heights = smoothed_heightmap
     else:
-        heights = WORLDSLICE.heightmaps["MOTION_BLOCKING_NO_LEAVES"]
+        heights = HEIGHTMAP
 
-    max_local_height = 0
+    # Palette blocks used in the loops below
+    foundation_block = _block(palette["foundation"])
+    floor_primary = _block(palette["floor_primary"])
+    floor_secondary = _block(palette["floor_secondary"])
 
-    # First, determine the maximum height in the area
-    for dx in range(process_area):
-        for dz in range(process_area):
-            # Calculate world coordinates
-            world_x = STARTX + optimal_x + dx
-            world_z = STARTZ + optimal_z + dz
-            
-            # Get height at this position
-            local_x = optimal_x + dx
-            local_z = optimal_z + dz
-            height = heights[(local_x, local_z)]
-
-            if height > max_local_height:
-                max_local_height = height
-
-    # Fill the entire optimal area with foundation material
-    for dx in range(process_area):
-        for dz in range(process_area):
-            # Calculate world coordinates
-            world_x = STARTX + optimal_x + dx
-            world_z = STARTZ + optimal_z + dz
-            
-            # Get height at this position
-            local_x = optimal_x + dx
-            local_z = optimal_z + dz
-            height = heights[(local_x, local_z)]  # Note: heightmap indices are (x,z)
+    # Heights of the whole area in one slice (heightmap indices are (x,z))
+    area_heights = heights[optimal_x:optimal_x + process_area, optimal_z:optimal_z + process_area]
+    max_local_height = int(area_heights.max())
+
+    # Fill the entire optimal area with foundation material, one cuboid per run of equal heights along z
+    for dx, column_heights in enumerate(area_heights.tolist()):
+        world_x = STARTX + optimal_x + dx
+        world_z = STARTZ + optimal_z
+        for height, run in groupby(column_heights):
+            run_end_z = world_z + len(list(run)) - 1
 
             # Clear any existing blocks above the foundation
-            for y in range(height + 1, height + 20):
-                ED.placeBlock((world_x, y, world_z), Block("air"))
+            geo.placeCuboid(ED, (world_x, height + 1, world_z), (world_x, height + 19, run_end_z), B_AIR)
             
-            # Place foundation blocks from the ground up to max_local_height
-            for y in range(height, max_local_height + 1):  # +1 to ensure a flat top surface
-                ED.placeBlock((world_x, y, world_z), Block(palette["foundation"]))
+            # Place foundation blocks from the ground up to max_local_height, inclusive for a flat top surface
+            geo.placeCuboid(ED, (world_x, height, world_z), (world_x, max_local_height, run_end_z), foundation_block)
+            world_z = run_end_z + 1
     
     # Calculate house dimensions - make it smaller than the foundation
     # Add a margin of at least 1 block on each side
@@ -269,9 +341,9 @@ def place_block(position, process_area, smoothed_heightmap):
             world_z = start_z + dz
             # Place floor at max_local_height + 1 (one block above the foundation)
             if (dx + dz) % 2 == 0:
-                ED.placeBlock((world_x, max_local_height, world_z), Block(palette["floor_primary"]))
+                ED.placeBlock((world_x, max_local_height, world_z), floor_primary)
             else:
-                ED.placeBlock((world_x, max_local_height, world_z), Block(palette["floor_secondary"]))
+                ED.placeBlock((world_x, max_local_height, world_z), floor_secondary)
 
     # Adjust the starting height for walls to be one block higher than the foundation
     floor_height = max_local_height + 1
@@ -287,37 +359,21 @@ def build_walls(ED, start_x, start_z, y, width, length, height, palette):
     print("Building walls...")
     
     # Front and back walls
-    for x in range(start_x, start_x + width + 1):
-        # Front wall
-        geo.placeCuboid(
-            ED,
-            (x, y - 1, start_z),
-            (x, y + height - 1, start_z),
-            Block(palette["walls"])
-        )
-        # Back wall
+    for z in [start_z, start_z + length]:
         geo.placeCuboid(
             ED,
-            (x, y - 1, start_z + length),
-            (x, y + height - 1, start_z + length),
-            Block(palette["walls"])
+            (start_x, y - 1, z),
+            (start_x + width, y + height - 1, z),
+            _block(palette["walls"])
         )
     
     # Side walls
-    for z in range(start_z, start_z + length + 1):
-        # Left wall
-        geo.placeCuboid(
-            ED,
-            (start_x, y - 1, z),
-            (start_x, y + height - 1, z),
-            Block(palette["walls"])
-        )
-        # Right wall
+    for x in [start_x, start_x + width]:
         geo.placeCuboid(
             ED,
-            (start_x + width, y - 1, z),
-            (start_x + width, y + height - 1, z),
-            Block(palette["walls"])
+            (x, y - 1, start_z),
+            (x, y + height - 1, start_z + length),
+            _block(palette["walls"])
         )
     
     # Corner pillars
@@ -327,53 +383,35 @@ def build_walls(ED, start_x, start_z, y, width, length, height, palette):
                 ED,
                 (x, y - 1, z),
                 (x, y + height - 1, z),
-                Block(palette["pillars"], {"axis": "y"})
+                _block(palette["pillars"], axis="y")
             )
 
 def build_roof(ED, start_x, start_z, y, width, length, height, palette):
     print("Building roof...")
-    # Triangular gables
+    # Triangular gables, front and back, one layer per row
+    gables = []
     for i in range(width//2 + 1):
-        # Front gable
-        geo.placeCuboid(
-            ED,
-            (start_x + i, y + height - 1 + i, start_z),
-            (start_x + width - i, y + height - 1 + i, start_z),
-            Block(palette["roof_frame"])
-        )
-        # Back gable
-        geo.placeCuboid(
-            ED,
-            (start_x + i, y + height - 1 + i, start_z + length),
-            (start_x + width - i, y + height - 1 + i, start_z + length),
-            Block(palette["roof_frame"])
-        )
+        for z in [start_z, start_z + length]:
+            gables.extend((x, y + height - 1 + i, z) for x in range(start_x + i, start_x + width - i + 1))
+    ED.placeBlock(gables, _block(palette["roof_frame"]))
     
-    # Roof slopes
-    for i in range(width//2 + 2):
-        if i == width//2 + 1:
-            # Ridge beam
-            geo.placeCuboid(
-                ED,
-                (start_x + width//2, y + height + i - 1, start_z - 1),
-                (start_x + width//2, y + height + i - 1, start_z + length + 1),
-                Block(palette["roof_ridge"])
-            )
-        else:
-            # Left slope
-            geo.placeCuboid(
-                ED,
-                (start_x + i, y + height + i, start_z - 1),
-                (start_x + i, y + height + i, start_z + length + 1),
-                Block(palette["roof_material"], {"facing": "east"})
-            )
-            # Right slope
-            geo.placeCuboid(
-                ED,
-                (start_x + width - i, y + height + i, start_z - 1),
-                (start_x + width - i, y + height + i, start_z + length + 1),
-                Block(palette["roof_material"], {"facing": "west"})
-            )
+    # Roof slopes, left then right so the right side wins where they meet
+    left_slope = []
+    right_slope = []
+    for i in range(width//2 + 1):
+        for z in range(start_z - 1, start_z + length + 2):
+            left_slope.append((start_x + i, y + height + i, z))
+            right_slope.append((start_x + width - i, y + height + i, z))
+    ED.placeBlock(left_slope, _block(palette["roof_material"], facing="east"))
+    ED.placeBlock(right_slope, _block(palette["roof_material"], facing="west"))
+    
+    # Ridge beam
+    geo.placeCuboid(
+        ED,
+        (start_x + width//2, y + height + width//2, start_z - 1),
+        (start_x + width//2, y + height + width//2, start_z + length + 1),
+        _block(palette["roof_ridge"])
+    )
 
 def add_details(ED, start_x, start_z, y, width, length, height, palette):
     print("Adding details...")
@@ -384,43 +422,43 @@ def add_details(ED, start_x, start_z, y, width, length, height, palette):
     ED.placeBlock((door_x, y, door_z), Block("spruce_door", {"facing": "east", "half": "lower"}))
     ED.placeBlock((door_x, y + 1, door_z), Block("spruce_door", {"facing": "east", "half": "upper"}))
     
-    # Windows
-    window_positions = []
+    # Windows every third block along each wall, as one (N, 2) array of (x, z)
+    z_offsets = np.arange(2, length - 1, 3)
+    x_offsets = np.arange(2, width - 1, 3)
+    window_positions = np.concatenate([
+        np.column_stack([np.full(len(z_offsets), start_x), start_z + z_offsets]),  # Left wall
+        np.column_stack([np.full(len(z_offsets), start_x + width), start_z + z_offsets]),  # Right wall
+        np.column_stack([start_x + x_offsets, np.full(len(x_offsets), start_z)]),  # Front wall
+        np.column_stack([start_x + x_offsets, np.full(len(x_offsets), start_z + length)]),  # Back wall
+    ])
     
-    # Side windows
-    for z_offset in range(2, length - 1, 3):
-        window_positions.append((start_x, start_z + z_offset))  # Left wall
-        window_positions.append((start_x + width, start_z + z_offset))  # Right wall
+    # Sills face out of their wall, known from the wall each window was built on
+    window_facings = np.array(["east"] * len(z_offsets) + ["west"] * len(z_offsets)
+                              + ["south"] * len(x_offsets) + ["north"] * len(x_offsets))
     
-    # Front and back windows
-    for x_offset in range(2, width - 1, 3):
-        window_positions.append((start_x + x_offset, start_z))  # Front wall
-        window_positions.append((start_x + x_offset, start_z + length))  # Back wall
+    # Skip the door position
+    not_door = ~((window_positions[:, 0] == door_x) & (window_positions[:, 1] == door_z))
+    window_positions, window_facings = window_positions[not_door], window_facings[not_door]
     
     # Calculate window height based on wall height
     window_height = max(2, height - 3)  # At least 2 blocks tall, but scales with wall height
     window_start_y = y + 1  # Start windows 1 block above the floor
+    pane_block = _block(palette["window_pane"])
+    sill_tops = {facing: _block(palette["window_sill"], facing=facing, half="top")
+                 for facing in ("north", "south", "east", "west")}
+    sill_bottoms = {facing: _block(palette["window_sill"], facing=facing, half="bottom")
+                    for facing in ("north", "south", "east", "west")}
     
-    for wx, wz in window_positions:
-        # Skip if it's the door position
-        if not (wx == door_x and wz == door_z):
-            # Place window panes with variable height
-            for wy in range(window_start_y, window_start_y + window_height):
-                ED.placeBlock((wx, wy, wz), Block(palette["window_pane"]))
-            
-            # Determine facing direction for window sills
-            facing = "north"
-            if wz == start_z: facing = "south"  # Front wall
-            elif wz == start_z + length: facing = "north"  # Back wall
-            elif wx == start_x: facing = "east"  # Left wall
-            elif wx == start_x + width: facing = "west"  # Right wall
-            
-            # Add window sill at the bottom
-            ED.placeBlock((wx, window_start_y - 1, wz), Block(palette["window_sill"], {"facing": facing, "half": "top"}))
-            
-            # Optionally add a decorative element above the window
-            if window_height < height - 3:  # If there's space above the window
-                ED.placeBlock((wx, window_start_y + window_height, wz), Block(palette["window_sill"], {"facing": facing, "half": "bottom"}))
+    for (wx, wz), facing in zip(window_positions.tolist(), window_facings.tolist()):
+        # Place window panes with variable height
+        geo.placeCuboid(ED, (wx, window_start_y, wz), (wx, window_start_y + window_height - 1, wz), pane_block)
+        
+        # Add window sill at the bottom
+        ED.placeBlock((wx, window_start_y - 1, wz), sill_tops[facing])
+        
+        # Optionally add a decorative element above the window
+        if window_height < height - 3:  # If there's space above the window
+            ED.placeBlock((wx, window_start_y + window_height, wz), sill_bottoms[facing])
     
     # Chimney
     chimney_x = start_x + width - 2
@@ -470,21 +508,22 @@ def add_interior(ED, start_x, start_z, y, width, length, height, palette):
     ED.placeBlock((table_x + 1, y, table_z), Block("oak_stairs", {"facing": "west"}))  # Chair
     
     # Lighting
-    for x_off in [width//4, width*3//4]:
-        for z_off in [length//4, length*3//4]:
-            ED.placeBlock((start_x + x_off, y + height - 2, start_z + z_off), 
-                         Block("lantern", {"hanging": "true"}))
+    ED.placeBlock([(start_x + x_off, y + height - 2, start_z + z_off)
+                   for x_off in [width//4, width*3//4] for z_off in [length//4, length*3//4]], B_LANTERN_HANG)
 
 # Example usage
 if __name__ == "__main__":
 
-    heightmap = WORLDSLICE.heightmaps["MOTION_BLOCKING_NO_LEAVES"] # The top non-air solid blocks.
+    heightmap = HEIGHTMAP
     
     # Find the flattest 10x10 sub-array
     
     sub_array_size = random.randint(10, 14)
     position, smoothed_heightmap, flattest_subarray = find_flattest_subarray(heightmap, sub_array_size)
     place_block(position, sub_array_size, smoothed_heightmap)
+    
+    # Send the rest of the build now rather than after the plot window is closed
+    ED.flushBuffer()
 
     # Visualize the results
     fig, axes = plt.subplots(1, 2, figsize=(12, 5))